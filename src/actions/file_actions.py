@@ -1,19 +1,166 @@
 """File operations: New, Open, Save, Save As."""
 
+import codecs
+import functools
 import os
 from pathlib import Path
 
+from PyQt6.QtCore import (
+    QCoreApplication, QEvent, QIODevice, QObject, QRunnable, QSaveFile, QThread,
+    QThreadPool, pyqtSignal
+)
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
 
+# Files larger than this are saved from a worker thread
+LARGE_FILE_THRESHOLD = 10 * 1024 * 1024
+
+# Laying out a multi-megabyte setPlainText blocks the UI for seconds, so
+# files above this size are streamed in and appended a chunk at a time
+STREAM_LOAD_THRESHOLD = 1024 * 1024
+LOAD_CHUNK_SIZE = 256 * 1024
+
+# Characters encoded per write when saving, so a save never holds a UTF-8
+# copy of the whole document alongside the text itself
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+# A UTF-8 byte order mark as it appears in decoded text. Qt strings drop it,
+# so it is split off on load and written back on save
+BOM = "\ufeff"
+
+# Skip per-entry icon and symlink probing, which stalls on slow/network mounts
+DIALOG_OPTIONS = (
+    QFileDialog.Option.DontUseCustomDirectoryIcons |
+    QFileDialog.Option.DontResolveSymlinks
+)
+
+
+@functools.lru_cache(maxsize=1)
 def get_default_directory():
-    """Get a sensible default directory for file dialogs."""
+    """Get a sensible default directory for file dialogs (computed once)."""
     documents = Path.home() / "Documents"
     if documents.exists():
         return str(documents)
     return str(Path.home())
 
 
+def read_text_file(file_path):
+    """Read a UTF-8 text file. Raises OSError on failure.
+
+    Newlines are normalized to LF and a leading BOM is kept as U+FEFF. Bytes
+    that aren't valid UTF-8 become surrogate escapes instead of aborting the
+    open, and write_text_file turns them back into the original bytes.
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    content = data.decode("utf-8", errors="surrogateescape")
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def file_has_bom(file_path):
+    """Check whether a file starts with a UTF-8 BOM. Raises OSError on failure."""
+    with open(file_path, "rb") as f:
+        return f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8
+
+
+def split_bom(text):
+    """Split a leading BOM off decoded text. Returns (text, had_bom)."""
+    if text.startswith(BOM):
+        return text[len(BOM):], True
+    return text, False
+
+
+def write_text_file(file_path, text, bom=False):
+    """Atomically write text as UTF-8 via QSaveFile. Raises OSError on failure.
+    
+    If bom is True the file starts with a UTF-8 byte order mark.
+    """
+    save_file = QSaveFile(file_path)
+    if not save_file.open(QIODevice.OpenModeFlag.WriteOnly | QIODevice.OpenModeFlag.Text):
+        raise OSError(save_file.errorString())
+    if bom:
+        save_file.write(codecs.BOM_UTF8)
+    for start in range(0, len(text), WRITE_CHUNK_SIZE):
+        chunk = text[start:start + WRITE_CHUNK_SIZE]
+        save_file.write(chunk.encode("utf-8", errors="surrogateescape"))
+    if not save_file.commit():
+        raise OSError(save_file.errorString())
+
+
+class ChunkedFileLoader(QThread):
+    """Reads a large UTF-8 text file on a worker thread, emitting it in chunks."""
+    
+    chunk_loaded = pyqtSignal(str)
+    load_failed = pyqtSignal(str)
+    
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self._file_path = file_path
+    
+    def run(self):
+        try:
+            with open(self._file_path, "r", encoding="utf-8-sig",
+                      errors="surrogateescape") as f:
+                while not self.isInterruptionRequested():
+                    chunk = f.read(LOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.chunk_loaded.emit(chunk)
+        except OSError as e:
+            self.load_failed.emit(str(e))
+
+
+class SaveSignals(QObject):
+    """Signals emitted by a SaveTask."""
+    
+    finished = pyqtSignal(str)  # error message, empty on success
+
+
+class SaveTask(QRunnable):
+    """Writes text to a file from a QThreadPool worker."""
+    
+    def __init__(self, file_path, text, bom=False):
+        super().__init__()
+        self.signals = SaveSignals()
+        self._file_path = file_path
+        self._text = text
+        self._bom = bom
+    
+    def run(self):
+        try:
+            write_text_file(self._file_path, self._text, self._bom)
+        except OSError as e:
+            self.signals.finished.emit(str(e) or "Could not save file")
+            return
+        self.signals.finished.emit("")
+
+
+@functools.lru_cache(maxsize=1)
+def save_thread_pool():
+    """Get the pool background saves run on (created once).
+    
+    It has a single thread, so saves commit in the order they were queued
+    and an older snapshot of a file can never overwrite a newer one.
+    """
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    return pool
+
+
+def save_in_background(file_path, text, on_finished, bom=False):
+    """Queue a SaveTask on the save thread pool; on_finished gets the error."""
+    task = SaveTask(file_path, text, bom)
+    task.signals.finished.connect(on_finished)
+    save_thread_pool().start(task)
+
+
+def wait_for_background_saves():
+    """Block until queued background saves finish and their results are delivered."""
+    save_thread_pool().waitForDone()
+    # The finished signals were queued to this thread; run their slots now
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.MetaCall)
+
+
 class FileActions:
     """Handles file operations for the editor."""
     
@@ -32,28 +179,50 @@ class FileActions:
     def document(self):
         return self.main_window.document
     
-    def _check_unsaved_changes(self):
-        """Prompt user if there are unsaved changes. Returns True if safe to proceed."""
-        doc = self.document
-        if not doc or not doc.is_modified:
+    def _check_all_unsaved_changes(self):
+        """Prompt once for every modified tab in every pane. Returns True if safe to proceed."""
+        modified = [
+            (tab_widget, tab)
+            for tab_widget in self.main_window.split_view_manager.tab_widgets()
+            for tab in tab_widget.modified_tabs()
+        ]
+        if not modified:
             return True
         
+        names = "\n".join(tab.document.display_name for _, tab in modified)
         reply = QMessageBox.question(
             self.main_window,
             "Unsaved Changes",
-            f"Save changes to {doc.display_name}?",
+            f"Save changes to the following files?\n\n{names}",
             QMessageBox.StandardButton.Save |
             QMessageBox.StandardButton.Discard |
             QMessageBox.StandardButton.Cancel
         )
         
         if reply == QMessageBox.StandardButton.Save:
-            return self.save_file()
+            return self._save_tabs(modified)
         elif reply == QMessageBox.StandardButton.Discard:
             return True
         else:
             return False
     
+    def _save_tabs(self, modified):
+        """Save (tab_widget, tab) pairs in one pass, asking for paths only for untitled tabs."""
+        for tab_widget, tab in modified:
+            if tab.document.file_path is None:
+                tab_widget.setCurrentWidget(tab.editor)
+                if not self._save_current_as(tab_widget):
+                    return False
+            elif not tab_widget.save_tab(tab, background=False):
+                QMessageBox.critical(
+                    self.main_window,
+                    "Error",
+                    f"Could not save {tab.document.display_name}"
+                )
+                return False
+        self.main_window.update_title()
+        return True
+    
     def new_file(self):
         """Create a new tab."""
         self.tab_widget.new_tab()
@@ -61,24 +230,27 @@ class FileActions:
         return True
     
     def open_file(self, file_path=None):
-        """Open a file in a new tab."""
-        if file_path is None:
+        """Open a file in a new tab, or ask for one or more files to open."""
+        if file_path is not None:
+            file_paths = [file_path] if file_path else []
+        else:
             start_dir = get_default_directory()
             doc = self.document
             if doc and doc.file_path:
                 start_dir = os.path.dirname(doc.file_path)
             
-            file_path, _ = QFileDialog.getOpenFileName(
+            file_paths, _ = QFileDialog.getOpenFileNames(
                 self.main_window,
                 "Open File",
                 start_dir,
-                "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
+                "All Files (*);;Text Files (*.txt);;Python Files (*.py)",
+                options=DIALOG_OPTIONS
             )
         
-        if not file_path:
+        if not file_paths:
             return False
         
-        result = self.tab_widget.open_file(file_path)
+        result = self.tab_widget.open_files(file_paths)
         self.main_window.update_title()
         return result
     
@@ -97,10 +269,16 @@ class FileActions:
     
     def save_file_as(self):
         """Save file with a new name."""
-        doc = self.document
-        editor = self.editor
-        if not doc or not editor:
+        return self._save_current_as(self.tab_widget)
+    
+    def _save_current_as(self, tab_widget):
+        """Save a tab widget's current tab under a name chosen by the user."""
+        tab = tab_widget.current_tab()
+        # A tab still loading its file holds only part of it
+        if not tab or tab.loader is not None:
             return False
+        doc = tab.document
+        editor = tab.editor
         
         if doc.file_path:
             default_path = doc.file_path
@@ -111,17 +289,17 @@ class FileActions:
             self.main_window,
             "Save File As",
             default_path,
-            "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
+            "All Files (*);;Text Files (*.txt);;Python Files (*.py)",
+            options=DIALOG_OPTIONS
         )
         
         if not file_path:
             return False
         
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(editor.toPlainText())
+            write_text_file(file_path, editor.toPlainText(), doc.has_bom)
             
-            self.tab_widget.mark_current_saved(file_path)
+            tab_widget.mark_current_saved(file_path)
             self.main_window.update_title()
             return True
         except Exception as e:
@@ -1,12 +1,15 @@
 """Document model for tracking file state."""
 
+import os
+
 
 class Document:
     """Tracks file path and modification state."""
     
     def __init__(self):
-        self._file_path = None
+        self.file_path = None
         self._is_modified = False
+        self.has_bom = False  # the file started with a UTF-8 byte order mark
     
     @property
     def file_path(self):
@@ -16,6 +19,8 @@ class Document:
     @file_path.setter
     def file_path(self, path):
         self._file_path = path
+        # Derived once here; display_name is read on every title update
+        self._display_name = os.path.basename(path) if path else "Untitled"
     
     @property
     def is_modified(self):
@@ -29,11 +34,10 @@ class Document:
     @property
     def display_name(self):
         """Filename for display, or 'Untitled' if no path."""
-        if self._file_path:
-            return self._file_path.split("/")[-1]
-        return "Untitled"
+        return self._display_name
     
     def reset(self):
         """Reset to initial state for new file."""
-        self._file_path = None
+        self.file_path = None
         self._is_modified = False
+        self.has_bom = False
@@ -1,5 +1,6 @@
 """Language definitions for syntax highlighting."""
 
+import re
 from enum import Enum, auto
 
 
@@ -31,7 +32,7 @@ TOKEN_COLORS = {
 
 
 class LanguageDefinition:
-    """Holds regex patterns for a language, ordered by priority."""
+    """Holds compiled regex patterns for a language, ordered by priority."""
 
     def __init__(self, name, patterns, multiline_patterns=None):
         """
@@ -39,29 +40,89 @@ class LanguageDefinition:
             name: Language name.
             patterns: List of (TokenType, regex_pattern_string) tuples.
             multiline_patterns: List of (TokenType, start_regex, end_regex) tuples.
+
+        Patterns are compiled once here so highlighters can share them. The
+        single-line patterns are also fused into one alternation regex whose
+        named groups G0..Gn map back to ``group_types``; earlier patterns win
+        when several match at the same position.
         """
         self.name = name
-        self.patterns = patterns
-        self.multiline_patterns = multiline_patterns or []
+        self.patterns = [
+            (token_type, re.compile(pattern)) for token_type, pattern in patterns
+        ]
+        self.group_types = [token_type for token_type, _ in patterns]
+        self.combined = None
+        if patterns:
+            self.combined = re.compile("|".join(
+                f"(?P<G{i}>{pattern})" for i, (_, pattern) in enumerate(patterns)
+            ))
+        self.multiline_patterns = [
+            (token_type, re.compile(start), re.compile(end))
+            for token_type, start, end in (multiline_patterns or [])
+        ]
+
+
+def _quoted(*quotes):
+    """Regex for backslash-escaped strings delimited by any of ``quotes``.
+
+    Uses the unrolled-loop form and lets an unterminated string run to the
+    end of the line, so every opening quote matches on the first attempt
+    instead of being retried (quadratically) from each later quote.
+    """
+    return "(?:" + "|".join(
+        rf'{q}[^{q}\\]*(?:\\.[^{q}\\]*)*(?:{q}|$)' for q in quotes
+    ) + ")"
+
+
+def _words(words):
+    """Regex matching any of the whitespace-separated ``words`` as a whole word.
+
+    The words are folded into a prefix trie (``a(?:nd|s(?:sert|ync)?)``...) so
+    the engine follows a single branch per character rather than retrying
+    every alternative at every word start.
+    """
+    trie = {}
+    for word in words.split():
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = None
+
+    def alternation(node):
+        branches = [
+            re.escape(char) + alternation(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+
+    return r"\b" + alternation(trie) + r"\b"
 
 
 def _python_definition():
-    keywords = (
-        r'\b(?:False|None|True|and|as|assert|async|await|break|class|continue|'
-        r'def|del|elif|else|except|finally|for|from|global|if|import|in|is|'
-        r'lambda|nonlocal|not|or|pass|raise|return|try|while|with|yield)\b'
+    keywords = _words(
+        "False None True and as assert async await break class continue "
+        "def del elif else except finally for from global if import in is "
+        "lambda nonlocal not or pass raise return try while with yield"
+    )
+    builtins = _words(
+        "print len range int str float list dict set tuple bool "
+        "type isinstance hasattr getattr setattr open super property "
+        "staticmethod classmethod enumerate zip map filter sorted reversed "
+        "abs min max sum any all input id repr hex oct bin chr ord"
     )
-    builtins = (
-        r'\b(?:print|len|range|int|str|float|list|dict|set|tuple|bool|'
-        r'type|isinstance|hasattr|getattr|setattr|open|super|property|'
-        r'staticmethod|classmethod|enumerate|zip|map|filter|sorted|reversed|'
-        r'abs|min|max|sum|any|all|input|id|repr|hex|oct|bin|chr|ord)\b'
+    types = _words(
+        "int str float bool list dict set tuple bytes bytearray complex "
+        "frozenset object"
     )
-    types = r'\b(?:int|str|float|bool|list|dict|set|tuple|bytes|bytearray|complex|frozenset|object)\b'
 
     patterns = [
         (TokenType.COMMENT, r'#[^\n]*'),
-        (TokenType.STRING, r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'),
+        (TokenType.STRING, _quoted('"', "'")),
         (TokenType.DECORATOR, r'@\w+(?:\.\w+)*'),
         (TokenType.KEYWORD, keywords),
         (TokenType.TYPE, types),
@@ -80,28 +141,31 @@ def _python_definition():
 
 
 def _javascript_definition():
-    keywords = (
-        r'\b(?:break|case|catch|class|const|continue|debugger|default|delete|'
-        r'do|else|export|extends|finally|for|function|if|import|in|instanceof|'
-        r'let|new|of|return|super|switch|this|throw|try|typeof|var|void|while|'
-        r'with|yield|async|await|from|static|get|set)\b'
+    keywords = _words(
+        "break case catch class const continue debugger default delete "
+        "do else export extends finally for function if import in instanceof "
+        "let new of return super switch this throw try typeof var void while "
+        "with yield async await from static get set"
+    )
+    builtins = _words(
+        "console document window Array Object String Number Boolean "
+        "Math JSON Promise Date RegExp Error Map Set Symbol parseInt "
+        "parseFloat isNaN isFinite undefined null NaN Infinity"
     )
-    builtins = (
-        r'\b(?:console|document|window|Array|Object|String|Number|Boolean|'
-        r'Math|JSON|Promise|Date|RegExp|Error|Map|Set|Symbol|parseInt|'
-        r'parseFloat|isNaN|isFinite|undefined|null|NaN|Infinity)\b'
+    types = _words(
+        "string number boolean object symbol bigint undefined null void "
+        "never any"
     )
-    types = r'\b(?:string|number|boolean|object|symbol|bigint|undefined|null|void|never|any)\b'
 
     patterns = [
         (TokenType.COMMENT, r'//[^\n]*'),
-        (TokenType.STRING, r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`(?:[^`\\]|\\.)*`)'),
+        (TokenType.STRING, _quoted('"', "'", '`')),
         (TokenType.KEYWORD, keywords),
         (TokenType.TYPE, types),
         (TokenType.BUILTIN, builtins),
         (TokenType.FUNCTION, r'\b\w+(?=\s*\()'),
         (TokenType.NUMBER, r'\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*(?:\.[\d_]+)?(?:[eE][+-]?\d+)?)\b'),
-        (TokenType.OPERATOR, r'[+\-*/%=<>!&|^~?:]+'),
+        (TokenType.OPERATOR, r'(?:[+\-*%=<>!&|^~?:]|/(?![/*]))+'),
     ]
 
     multiline_patterns = [
@@ -117,7 +181,10 @@ def _html_definition():
         (TokenType.STRING, r'(?:"[^"]*"|\'[^\']*\')'),
         (TokenType.DECORATOR, r'</?[\w-]+'),  # tags
         (TokenType.DECORATOR, r'/?>'),  # closing angle brackets
-        (TokenType.KEYWORD, r'\b(?:class|id|href|src|style|type|name|value|alt|title|rel|lang|charset|content|http-equiv)\b'),
+        (TokenType.KEYWORD, _words(
+            "class id href src style type name value alt title rel lang "
+            "charset content http-equiv"
+        )),
         (TokenType.BUILTIN, r'&\w+;'),  # HTML entities
     ]
 
@@ -129,16 +196,16 @@ def _html_definition():
 
 
 def _css_definition():
-    keywords = (
-        r'\b(?:important|inherit|initial|unset|none|auto|block|inline|flex|grid|'
-        r'absolute|relative|fixed|sticky|solid|dashed|dotted|hidden|visible|'
-        r'normal|bold|italic|center|left|right|top|bottom)\b'
+    keywords = _words(
+        "important inherit initial unset none auto block inline flex grid "
+        "absolute relative fixed sticky solid dashed dotted hidden visible "
+        "normal bold italic center left right top bottom"
     )
-    builtins = (
-        r'\b(?:color|background|margin|padding|border|font|display|position|'
-        r'width|height|max-width|min-width|max-height|min-height|overflow|'
-        r'text-align|text-decoration|line-height|opacity|z-index|transition|'
-        r'transform|animation|box-shadow|cursor|content|float|clear)\b'
+    builtins = _words(
+        "color background margin padding border font display position "
+        "width height max-width min-width max-height min-height overflow "
+        "text-align text-decoration line-height opacity z-index transition "
+        "transform animation box-shadow cursor content float clear"
     )
 
     patterns = [
@@ -1,27 +1,36 @@
 """Detect programming language from file extension."""
 
-import os
+import functools
 
 
 class LanguageDetector:
     """Detects language from file path extension."""
 
+    # Keys are lowercase extensions without the leading dot
     EXTENSION_MAP = {
-        ".py": "python",
-        ".pyw": "python",
-        ".js": "javascript",
-        ".mjs": "javascript",
-        ".cjs": "javascript",
-        ".jsx": "javascript",
-        ".html": "html",
-        ".htm": "html",
-        ".css": "css",
+        "py": "python",
+        "pyw": "python",
+        "js": "javascript",
+        "mjs": "javascript",
+        "cjs": "javascript",
+        "jsx": "javascript",
+        "html": "html",
+        "htm": "html",
+        "css": "css",
     }
 
     @staticmethod
     def detect_language(file_path):
         """Return language name for the given file path, or None."""
-        if not file_path:
-            return None
-        _, ext = os.path.splitext(file_path)
-        return LanguageDetector.EXTENSION_MAP.get(ext.lower())
+        return detect_language(file_path)
+
+
+@functools.lru_cache(maxsize=256)
+def detect_language(file_path):
+    """Return language name for the given file path, or None (memoized)."""
+    if not file_path:
+        return None
+    _, dot, ext = file_path.rpartition(".")
+    if not dot:
+        return None
+    return LanguageDetector.EXTENSION_MAP.get(ext.lower())
@@ -1,24 +1,45 @@
 """Syntax highlighter using QSyntaxHighlighter."""
 
-import re
+from collections import OrderedDict
 
-from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QTextCursor, QColor
+from PyQt6.QtCore import Qt, QTimer
 
 from editor.language_definitions import LANGUAGES, TOKEN_COLORS, TokenType
 
 
+# Maximum number of (previous state, line text) results kept per highlighter
+BLOCK_CACHE_SIZE = 4096
+
+# Language switches on documents longer than this are highlighted in
+# event-loop slices of this many blocks so the editor stays responsive
+REHIGHLIGHT_CHUNK_BLOCKS = 500
+
+
 class SyntaxHighlighter(QSyntaxHighlighter):
     """Multi-language syntax highlighter."""
 
     def __init__(self, document):
         super().__init__(document)
         self._language = None
-        self._patterns = []  # compiled (TokenType, regex) pairs
-        self._multiline_patterns = []  # (TokenType, start_re, end_re) compiled
+        self._combined = None  # fused single-line regex with G<i> groups
+        self._group_formats = []  # QTextCharFormat indexed by match.lastindex
+        self._multiline_patterns = []  # (QTextCharFormat, start_re, end_re, state_bit)
+        self._block_caches = {}  # language -> its block cache
+        self._block_cache = OrderedDict()  # (prev_state, text) -> (formats, state)
         self._formats = {}
         self._build_formats()
 
+        # Blocks from this cursor's position on are left alone until the
+        # chunked rehighlight reaches them. A cursor rather than a block
+        # number, so the point moves with edits made while the pass runs
+        # (None when no chunked pass is running)
+        self._deferred_from = None
+        self._chunk_timer = QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.setInterval(0)
+        self._chunk_timer.timeout.connect(self._highlight_next_chunk)
+
     def _build_formats(self):
         """Build QTextCharFormat for each token type."""
         for token_type, color in TOKEN_COLORS.items():
@@ -35,53 +56,153 @@ class SyntaxHighlighter(QSyntaxHighlighter):
         if language_name == self._language:
             return
         self._language = language_name
-        self._patterns = []
+        self._combined = None
+        self._group_formats = []
         self._multiline_patterns = []
+        # Results depend only on the pattern set, so each language keeps its
+        # own cache and switching back replays it instead of re-lexing
+        self._block_cache = self._block_caches.setdefault(language_name, OrderedDict())
 
         if language_name and language_name in LANGUAGES:
             lang_def = LANGUAGES[language_name]
-            for token_type, pattern in lang_def.patterns:
-                self._patterns.append((token_type, re.compile(pattern)))
-            for i, (token_type, start, end) in enumerate(lang_def.multiline_patterns):
-                self._multiline_patterns.append(
-                    (token_type, re.compile(start), re.compile(end))
-                )
-
-        self.rehighlight()
+            self._combined = lang_def.combined
+            # Each construct gets its own bit in the block state
+            self._multiline_patterns = [
+                (self._formats[token_type], start_re, end_re, 1 << i)
+                for i, (token_type, start_re, end_re)
+                in enumerate(lang_def.multiline_patterns)
+            ]
+            if lang_def.combined is not None:
+                self._group_formats = self._build_group_formats(lang_def)
+
+        self._rehighlight_in_chunks()
+
+    def _build_group_formats(self, lang_def):
+        """Map each G<i> group's number in the fused regex to its format."""
+        group_formats = [None] * (lang_def.combined.groups + 1)
+        for name, number in lang_def.combined.groupindex.items():
+            token_type = lang_def.group_types[int(name[1:])]
+            group_formats[number] = self._formats[token_type]
+        return group_formats
 
     @property
     def language(self):
         return self._language
 
+    def rehighlight(self):
+        """Rehighlight the whole document now, superseding any chunked pass."""
+        self._chunk_timer.stop()
+        self._deferred_from = None
+        super().rehighlight()
+
+    def _rehighlight_in_chunks(self):
+        """Rehighlight the document, in timer slices if it is long."""
+        document = self.document()
+        if (not self._language or document is None or
+                document.blockCount() <= REHIGHLIGHT_CHUNK_BLOCKS):
+            self.rehighlight()
+            return
+        self._deferred_from = QTextCursor(document)
+        self._highlight_next_chunk()
+
+    def _highlight_next_chunk(self):
+        """Highlight the next REHIGHLIGHT_CHUNK_BLOCKS blocks, then yield."""
+        document = self.document()
+        block = document.findBlock(self._deferred_from.position())
+        if not block.isValid():
+            self._deferred_from = None
+            return
+
+        # Qt keeps highlighting past a block whose state changed; resetting
+        # the slice's states makes that carry through the whole slice, and
+        # highlightBlock stops it at the first deferred block
+        first = block
+        for _ in range(REHIGHLIGHT_CHUNK_BLOCKS):
+            if not block.isValid():
+                break
+            block.setUserState(-1)
+            block = block.next()
+        if block.isValid():
+            self._deferred_from.setPosition(block.position())
+        else:
+            self._deferred_from = None
+        self.rehighlightBlock(first)
+
+        if self._deferred_from is not None:
+            self._chunk_timer.start()
+
     def highlightBlock(self, text):
         """Highlight a single block of text."""
         if not self._language:
             return
+        if (self._deferred_from is not None and
+                self.currentBlock().position() >= self._deferred_from.position()):
+            return
+
+        prev_state = max(self.previousBlockState(), 0)
+
+        # Blank lines have no tokens and can't open or close a multi-line
+        # construct (no delimiter is whitespace), so just carry the state over
+        if not text or text.isspace():
+            self.setCurrentBlockState(prev_state)
+            return
+
+        # Unchanged lines with the same incoming state replay cached results
+        key = (prev_state, text)
+        cached = self._block_cache.get(key)
+        if cached is None:
+            cached = self._tokenize(text, prev_state)
+            self._block_cache[key] = cached
+            if len(self._block_cache) > BLOCK_CACHE_SIZE:
+                self._block_cache.popitem(last=False)
+        else:
+            self._block_cache.move_to_end(key)
+
+        formats, state = cached
+        set_format = self.setFormat
+        for start, length, fmt in formats:
+            set_format(start, length, fmt)
+        self.setCurrentBlockState(state)
+
+    def _tokenize(self, text, prev_state):
+        """Return ([(start, length, format)], block_state) for a block."""
+        formats = []
+        state = 0
 
-        # Track which character positions are already highlighted
-        highlighted = set()
+        # (start, end) spans already claimed by multi-line constructs
+        regions = []
 
         # Handle multi-line patterns first
-        for i, (token_type, start_re, end_re) in enumerate(self._multiline_patterns):
-            state_bit = i + 1
-            self._apply_multiline(text, token_type, start_re, end_re, state_bit, highlighted)
-
-        # Apply single-line patterns (skip already-highlighted regions)
-        for token_type, regex in self._patterns:
-            for match in regex.finditer(text):
-                start = match.start()
-                length = match.end() - match.start()
-                # Skip if any character in this range is already highlighted
-                if any(pos in highlighted for pos in range(start, start + length)):
-                    continue
-                self.setFormat(start, length, self._formats[token_type])
-                highlighted.update(range(start, start + length))
-
-    def _apply_multiline(self, text, token_type, start_re, end_re, state_bit, highlighted):
-        """Handle multi-line constructs like triple-quoted strings and block comments."""
-        fmt = self._formats[token_type]
-        prev_state = self.previousBlockState()
-        in_multiline = (prev_state & state_bit) != 0 if prev_state != -1 else False
+        for fmt, start_re, end_re, state_bit in self._multiline_patterns:
+            if self._apply_multiline(text, fmt, start_re, end_re, state_bit,
+                                     prev_state, regions, formats):
+                state |= state_bit
+
+        if self._combined is None:
+            return formats, state
+
+        # Lex the gaps between multi-line regions, one left-to-right pass each.
+        # The outermost G<i> group closes last, so lastindex identifies it.
+        finditer = self._combined.finditer
+        group_formats = self._group_formats
+        append = formats.append
+        text_len = len(text)
+        pos = 0
+        for region_start, region_end in sorted(regions) + [(text_len, text_len)]:
+            for match in finditer(text, pos, region_start):
+                start, end = match.span()
+                append((start, end - start, group_formats[match.lastindex]))
+            pos = max(pos, region_end)
+
+        return formats, state
+
+    def _apply_multiline(self, text, fmt, start_re, end_re, state_bit,
+                         prev_state, regions, formats):
+        """Handle multi-line constructs like triple-quoted strings and block comments.
+
+        Returns True if the construct is still open at the end of the block.
+        """
+        in_multiline = (prev_state & state_bit) != 0
 
         start = 0
         text_len = len(text)
@@ -91,15 +212,14 @@ class SyntaxHighlighter(QSyntaxHighlighter):
             match = end_re.search(text, start)
             if match:
                 end_pos = match.end()
-                self.setFormat(0, end_pos, fmt)
-                highlighted.update(range(0, end_pos))
+                formats.append((0, end_pos, fmt))
+                regions.append((0, end_pos))
                 start = end_pos
                 in_multiline = False
             else:
-                self.setFormat(0, text_len, fmt)
-                highlighted.update(range(0, text_len))
-                self._set_state_bit(state_bit, True)
-                return
+                formats.append((0, text_len, fmt))
+                regions.append((0, text_len))
+                return True
 
         # Look for new multi-line starts
         while start < text_len:
@@ -107,31 +227,21 @@ class SyntaxHighlighter(QSyntaxHighlighter):
             if not match:
                 break
             ms = match.start()
-            if any(pos in highlighted for pos in range(ms, ms + len(match.group()))):
+            me = match.end()
+            if any(rs < me and ms < rend for rs, rend in regions):
                 start = match.end()
                 continue
             # Look for end on same line
             end_match = end_re.search(text, match.end())
             if end_match:
                 end_pos = end_match.end()
-                self.setFormat(ms, end_pos - ms, fmt)
-                highlighted.update(range(ms, end_pos))
+                formats.append((ms, end_pos - ms, fmt))
+                regions.append((ms, end_pos))
                 start = end_pos
             else:
-                self.setFormat(ms, text_len - ms, fmt)
-                highlighted.update(range(ms, text_len))
+                formats.append((ms, text_len - ms, fmt))
+                regions.append((ms, text_len))
                 in_multiline = True
                 break
 
-        self._set_state_bit(state_bit, in_multiline)
-
-    def _set_state_bit(self, bit, value):
-        """Set or clear a bit in the current block state."""
-        state = self.currentBlockState()
-        if state == -1:
-            state = 0
-        if value:
-            state |= bit
-        else:
-            state &= ~bit
-        self.setCurrentBlockState(state)
+        return in_multiline
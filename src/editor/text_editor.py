@@ -7,6 +7,12 @@ from PyQt6.QtCore import Qt, QRect, QSize
 from editor.syntax_highlighter import SyntaxHighlighter
 
 
+# Built once rather than on every cursor move and line number repaint
+CURRENT_LINE_COLOR = QColor(50, 50, 50)
+LINE_NUMBER_BG = QColor(30, 30, 30)
+LINE_NUMBER_FG = QColor(100, 100, 100)
+
+
 class LineNumberArea(QWidget):
     """Widget that displays line numbers alongside the editor."""
     
@@ -29,6 +35,8 @@ class TextEditor(QPlainTextEdit):
         self.line_number_area = LineNumberArea(self)
         
         self.syntax_highlighter = SyntaxHighlighter(self.document())
+        self._syntax_language = None
+        self._shown = False
 
         self._setup_appearance()
         self._connect_signals()
@@ -85,8 +93,7 @@ class TextEditor(QPlainTextEdit):
         
         if not self.isReadOnly():
             selection = QTextEdit.ExtraSelection()
-            line_color = QColor(50, 50, 50)
-            selection.format.setBackground(line_color)
+            selection.format.setBackground(CURRENT_LINE_COLOR)
             selection.format.setProperty(QTextFormat.Property.FullWidthSelection, True)
             selection.cursor = self.textCursor()
             selection.cursor.clearSelection()
@@ -97,7 +104,8 @@ class TextEditor(QPlainTextEdit):
     def line_number_area_paint_event(self, event):
         """Paint the line numbers."""
         painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor(30, 30, 30))
+        painter.fillRect(event.rect(), LINE_NUMBER_BG)
+        painter.setPen(LINE_NUMBER_FG)
         
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
@@ -107,7 +115,6 @@ class TextEditor(QPlainTextEdit):
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
                 number = str(block_number + 1)
-                painter.setPen(QColor(100, 100, 100))
                 painter.drawText(
                     0, top,
                     self.line_number_area.width() - 5,
@@ -122,8 +129,21 @@ class TextEditor(QPlainTextEdit):
             block_number += 1
     
     def set_syntax_language(self, language):
-        """Set the syntax highlighting language."""
-        self.syntax_highlighter.set_language(language)
+        """Set the syntax highlighting language.
+        
+        Until the editor is first shown the language is only remembered, so
+        tabs opened in the background don't highlight their whole document.
+        """
+        self._syntax_language = language
+        if self._shown:
+            self.syntax_highlighter.set_language(language)
+    
+    def showEvent(self, event):
+        """Apply the syntax language the first time the editor is shown."""
+        super().showEvent(event)
+        if not self._shown:
+            self._shown = True
+            self.syntax_highlighter.set_language(self._syntax_language)
 
     _BRACKET_PAIRS = {'(': ')', '[': ']', '{': '}'}
     _QUOTE_CHARS = {'"', "'"}
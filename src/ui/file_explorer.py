@@ -9,6 +9,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFileSystemModel
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from actions.file_actions import DIALOG_OPTIONS
+
 
 BUTTON_STYLE = """
     QPushButton {
@@ -83,6 +85,21 @@ class FileExplorer(QWidget):
         
         self.stack.addWidget(empty_widget)
         
+        # The folder tree (and its QFileSystemModel, which starts a gatherer
+        # thread) is only built the first time a folder is opened
+        self.model = None
+        self.tree = None
+        
+        layout.addWidget(self.stack)
+        
+        # Start with empty state
+        self.stack.setCurrentIndex(0)
+    
+    def _ensure_tree(self):
+        """Build the folder tree page on first use."""
+        if self.tree is not None:
+            return
+        
         # Tree view widget
         tree_widget = QWidget()
         tree_layout = QVBoxLayout(tree_widget)
@@ -119,11 +136,6 @@ class FileExplorer(QWidget):
         tree_layout.addWidget(close_btn)
         
         self.stack.addWidget(tree_widget)
-        
-        layout.addWidget(self.stack)
-        
-        # Start with empty state
-        self.stack.setCurrentIndex(0)
     
     def _open_file_dialog(self):
         """Open a dialog to select a file."""
@@ -131,7 +143,8 @@ class FileExplorer(QWidget):
             self,
             "Open File",
             str(Path.home()),
-            "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
+            "All Files (*);;Text Files (*.txt);;Python Files (*.py)",
+            options=DIALOG_OPTIONS
         )
         if file_path:
             parent_folder = str(Path(file_path).parent)
@@ -144,7 +157,7 @@ class FileExplorer(QWidget):
             self,
             "Open Folder",
             str(Path.home()),
-            QFileDialog.Option.ShowDirsOnly
+            QFileDialog.Option.ShowDirsOnly | DIALOG_OPTIONS
         )
         if folder:
             self.set_root_path(folder)
@@ -158,6 +171,7 @@ class FileExplorer(QWidget):
     def set_root_path(self, path):
         """Set the root directory for the file explorer."""
         self._root_path = path
+        self._ensure_tree()
         self.model.setRootPath(path)
         self.tree.setRootIndex(self.model.index(path))
         self.stack.setCurrentIndex(1)
@@ -1,9 +1,9 @@
 """Main application window."""
 
 from PyQt6.QtWidgets import QMainWindow, QSplitter
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSlot
 
-from actions.file_actions import FileActions
+from actions.file_actions import FileActions, wait_for_background_saves
 from ui.menu_bar import setup_menu_bar
 from ui.file_explorer import FileExplorer
 from ui.split_view import SplitViewManager
@@ -20,6 +20,7 @@ class MainWindow(QMainWindow):
         self.split_view_manager.tab_widget.current_document_changed.connect(self.update_title)
         self.file_explorer = FileExplorer(self)
         self.file_actions = FileActions(self)
+        self._explorer_width = 200  # restored when the explorer is shown again
         
         self._setup_ui()
         self._connect_signals()
@@ -36,8 +37,8 @@ class MainWindow(QMainWindow):
         self.splitter.addWidget(self.file_explorer)
         self.splitter.addWidget(self.split_view_manager)
         
-        # Set initial sizes (200px for explorer, rest for editor)
-        self.splitter.setSizes([200, 600])
+        # Set initial sizes (explorer width, rest for editor)
+        self.splitter.setSizes([self._explorer_width, 600])
         self.splitter.setCollapsible(0, True)
         self.splitter.setCollapsible(1, False)
         
@@ -46,11 +47,14 @@ class MainWindow(QMainWindow):
         
         self.actions = setup_menu_bar(self, self.file_actions)
         self.update_title()
+        self.update_actions()
     
     def _connect_signals(self):
         """Connect signals to update window state."""
         self.file_explorer.file_selected.connect(self._on_file_selected)
+        self.tab_widget.current_document_changed.connect(self.update_actions)
     
+    @pyqtSlot(str)
     def _on_file_selected(self, file_path):
         """Open file selected from file explorer in a new tab."""
         self.tab_widget.new_tab(file_path)
@@ -65,6 +69,7 @@ class MainWindow(QMainWindow):
         """Get the current document (for compatibility)."""
         return self.split_view_manager.current_document
     
+    @pyqtSlot()
     def toggle_file_explorer(self):
         """Toggle visibility of the file explorer."""
         if self.file_explorer.isVisible():
@@ -72,9 +77,9 @@ class MainWindow(QMainWindow):
             self.file_explorer.hide()
         else:
             self.file_explorer.show()
-            width = getattr(self, '_explorer_width', 200)
-            self.splitter.setSizes([width, self.splitter.sizes()[1]])
+            self.splitter.setSizes([self._explorer_width, self.splitter.sizes()[1]])
     
+    @pyqtSlot()
     def update_title(self):
         """Update window title with filename and modified indicator."""
         doc = self.document
@@ -86,9 +91,20 @@ class MainWindow(QMainWindow):
             title = "PyNano"
         self.setWindowTitle(title)
     
+    @pyqtSlot()
+    def update_actions(self):
+        """Disable saving while the current tab is still loading its file."""
+        tab = self.tab_widget.current_tab()
+        can_save = tab is not None and tab.loader is None
+        self.actions["save"].setEnabled(can_save)
+        self.actions["save_as"].setEnabled(can_save)
+    
     def closeEvent(self, event):
         """Handle window close with unsaved changes check."""
-        if self.file_actions._check_unsaved_changes():
+        # Finish background saves first: a failed one flags its tab modified
+        # again, so it is caught by the unsaved-changes prompt below
+        wait_for_background_saves()
+        if self.file_actions._check_all_unsaved_changes():
             event.accept()
         else:
             event.ignore()
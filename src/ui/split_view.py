@@ -1,10 +1,15 @@
 """Split view manager for editor panes."""
 
 from PyQt6.QtWidgets import QSplitter, QWidget, QVBoxLayout, QHBoxLayout
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QRect, QSize, QTimer
-from PyQt6.QtGui import QPainter, QColor
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QPoint, QRect, QSize, QTimer
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen
 
-from ui.tab_widget import TabWidget
+from ui.tab_widget import TAB_STYLE, TabWidget
+
+
+# Drop zone highlight, built once rather than on every drag repaint
+ZONE_BRUSH = QBrush(QColor(0, 170, 170, 80))
+ZONE_PEN = QPen(QColor(0, 170, 170, 200))
 
 
 class DropZoneOverlay(QWidget):
@@ -18,75 +23,113 @@ class DropZoneOverlay(QWidget):
         self.setMouseTracking(True)
         self._active_zone = None
         self._visible = False
+        
+        # Zone rectangles, rebuilt only when the overlay's size changes
+        self._zone_rects = {}
+        self._zone_rects_size = None
+        
+        # Drag moves arrive per mouse pixel; only the latest position is
+        # hit-tested, once the event loop has drained the pending ones
+        self._pending_pos = None
+        self._track_timer = QTimer(self)
+        self._track_timer.setSingleShot(True)
+        self._track_timer.setInterval(0)
+        self._track_timer.timeout.connect(self._apply_pending_pos)
     
     def show_zones(self):
         """Show the drop zone overlay."""
+        if self._visible:
+            return
         self._visible = True
         self.raise_()
         self.show()
-        self.update()
     
     def hide_zones(self):
         """Hide the drop zone overlay."""
         self._visible = False
         self._active_zone = None
+        self._track_timer.stop()
         self.hide()
     
     def get_zone_at(self, pos):
         """Determine which zone the position is in based on which half the cursor is closest to."""
-        rect = self.rect()
-        w, h = rect.width(), rect.height()
+        w, h = self.width(), self.height()
         x, y = pos.x(), pos.y()
         
-        dist_top = y
-        dist_bottom = h - y
-        dist_left = x
-        dist_right = w - x
-        
-        min_dist = min(dist_top, dist_bottom, dist_left, dist_right)
-        
-        if min_dist == dist_top:
-            return 'top'
-        elif min_dist == dist_bottom:
-            return 'bottom'
-        elif min_dist == dist_left:
-            return 'left'
+        # Nearest horizontal and vertical edge, then the nearer of the two;
+        # ties go top, bottom, left, right
+        if y <= h - y:
+            vertical, dist_vertical = 'top', y
         else:
-            return 'right'
+            vertical, dist_vertical = 'bottom', h - y
+        if x <= w - x:
+            horizontal, dist_horizontal = 'left', x
+        else:
+            horizontal, dist_horizontal = 'right', w - x
+        
+        return vertical if dist_vertical <= dist_horizontal else horizontal
     
     def get_zone_rect(self, zone):
         """Get the rectangle for a specific zone - highlights half the window."""
-        rect = self.rect()
-        w, h = rect.width(), rect.height()
-        
-        if zone == 'top':
-            return QRect(0, 0, w, h // 2)
-        elif zone == 'bottom':
-            return QRect(0, h // 2, w, h // 2)
-        elif zone == 'left':
-            return QRect(0, 0, w // 2, h)
-        elif zone == 'right':
-            return QRect(w // 2, 0, w // 2, h)
-        return QRect()
+        size = (self.width(), self.height())
+        if size != self._zone_rects_size:
+            self._zone_rects = self._calculate_zones(*size)
+            self._zone_rects_size = size
+        return self._zone_rects.get(zone, QRect())
+    
+    @staticmethod
+    def _calculate_zones(w, h):
+        """Build the zone rectangles for an overlay of the given size."""
+        return {
+            'top': QRect(0, 0, w, h // 2),
+            'bottom': QRect(0, h // 2, w, h // 2),
+            'left': QRect(0, 0, w // 2, h),
+            'right': QRect(w // 2, 0, w // 2, h),
+        }
+    
+    def _zone_paint_rect(self, zone):
+        """Get the area painted for a zone, including its 1px outline."""
+        rect = self.get_zone_rect(zone)
+        # Growing an empty rect would make it valid and dirty the top-left corner
+        if rect.isEmpty():
+            return rect
+        return rect.adjusted(0, 0, 1, 1)
     
     def set_active_zone(self, zone):
         """Set the currently highlighted zone."""
         if self._active_zone != zone:
+            # Only the old and new highlights need repainting
+            dirty = self._zone_paint_rect(self._active_zone).united(
+                self._zone_paint_rect(zone))
             self._active_zone = zone
-            self.update()
+            self.update(dirty)
+    
+    def track(self, pos):
+        """Highlight the zone under pos on the next event loop pass."""
+        self._pending_pos = pos
+        self._track_timer.start()
+    
+    @pyqtSlot()
+    def _apply_pending_pos(self):
+        """Highlight the zone under the most recently tracked position."""
+        self.set_active_zone(self.get_zone_at(self._pending_pos))
     
     def paintEvent(self, event):
-        if not self._visible:
+        # Nothing is drawn until the drag has moved over a zone
+        if not self._visible or self._active_zone is None:
             return
         
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Qt already clips painting to the invalidated region; skip the
+        # painter entirely when that region misses the highlight
+        zone_rect = self.get_zone_rect(self._active_zone)
+        if not event.region().intersects(zone_rect.adjusted(0, 0, 1, 1)):
+            return
         
-        if self._active_zone:
-            zone_rect = self.get_zone_rect(self._active_zone)
-            painter.fillRect(zone_rect, QColor(0, 170, 170, 80))
-            painter.setPen(QColor(0, 170, 170, 200))
-            painter.drawRect(zone_rect)
+        # Only axis-aligned rectangles are drawn, so no antialiasing
+        painter = QPainter(self)
+        painter.fillRect(zone_rect, ZONE_BRUSH)
+        painter.setPen(ZONE_PEN)
+        painter.drawRect(zone_rect)
 
 
 class SplitPane(QWidget):
@@ -100,24 +143,30 @@ class SplitPane(QWidget):
         super().__init__(parent)
         self.setAcceptDrops(True)
         
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        
-        self.tab_widget = TabWidget()
+        # The tab widget fills the pane and is sized in resizeEvent, like the
+        # overlay, rather than through a single-child layout
+        self.tab_widget = TabWidget(self)
         self.tab_widget.last_tab_closed.connect(self._on_last_tab_closed)
-        layout.addWidget(self.tab_widget)
         
         self.drop_overlay = DropZoneOverlay(self)
         self.drop_overlay.hide()
     
+    @pyqtSlot()
     def _on_last_tab_closed(self):
         """Handle when the last tab in this pane is closed."""
         self.close_requested.emit(self)
     
+    def sizeHint(self):
+        return self.tab_widget.sizeHint()
+    
+    def minimumSizeHint(self):
+        return self.tab_widget.minimumSizeHint()
+    
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.drop_overlay.setGeometry(self.rect())
+        rect = self.rect()
+        self.tab_widget.setGeometry(rect)
+        self.drop_overlay.setGeometry(rect)
     
     def dragEnterEvent(self, event):
         mime = event.mimeData()
@@ -126,8 +175,7 @@ class SplitPane(QWidget):
             self.drop_overlay.show_zones()
     
     def dragMoveEvent(self, event):
-        zone = self.drop_overlay.get_zone_at(event.position().toPoint())
-        self.drop_overlay.set_active_zone(zone)
+        self.drop_overlay.track(event.position().toPoint())
         event.acceptProposedAction()
     
     def dragLeaveEvent(self, event):
@@ -179,6 +227,10 @@ class SplitViewManager(QWidget):
         self._main_layout.setContentsMargins(0, 0, 0, 0)
         self._main_layout.setSpacing(0)
         
+        # Cascades to the tab widget of every pane, so the sheet is parsed
+        # once instead of on each split
+        self.setStyleSheet(TAB_STYLE)
+        
         self._root_pane = self._create_pane()
         self._main_layout.addWidget(self._root_pane)
         self._panes.append(self._root_pane)
@@ -208,6 +260,10 @@ class SplitViewManager(QWidget):
             return self._panes[0].tab_widget
         return None
     
+    def tab_widgets(self):
+        """Get the tab widget of every pane."""
+        return [pane.tab_widget for pane in self._panes]
+    
     @property
     def current_editor(self):
         """Get the current editor from the focused pane."""
@@ -227,6 +283,7 @@ class SplitViewManager(QWidget):
         if self._original_size is None:
             self._original_size = QSize(size)
     
+    @pyqtSlot(object, str, str)
     def _handle_split(self, source_pane, direction, file_path):
         """Handle a split request from a pane."""
         if not self._is_split:
@@ -240,47 +297,9 @@ class SplitViewManager(QWidget):
         if file_path:
             new_pane.tab_widget.open_file(file_path)
         
-        if direction in ('left', 'right'):
-            orientation = Qt.Orientation.Horizontal
-            total_size = source_pane.width()
-        else:
-            orientation = Qt.Orientation.Vertical
-            total_size = source_pane.height()
-        
-        half_size = total_size // 2
-        
-        splitter = QSplitter(orientation)
-        self._splitters.append(splitter)
-        
-        parent = source_pane.parent()
-        if isinstance(parent, QSplitter):
-            index = parent.indexOf(source_pane)
-            source_pane.setParent(None)
-            
-            if direction in ('left', 'top'):
-                splitter.addWidget(new_pane)
-                splitter.addWidget(source_pane)
-            else:
-                splitter.addWidget(source_pane)
-                splitter.addWidget(new_pane)
-            
-            parent.insertWidget(index, splitter)
-        else:
-            self._main_layout.removeWidget(source_pane)
-            source_pane.setParent(None)
-            
-            if direction in ('left', 'top'):
-                splitter.addWidget(new_pane)
-                splitter.addWidget(source_pane)
-            else:
-                splitter.addWidget(source_pane)
-                splitter.addWidget(new_pane)
-            
-            self._main_layout.addWidget(splitter)
-        
-        QTimer.singleShot(0, lambda: splitter.setSizes([half_size, half_size]))
-        self._is_split = True
+        self._insert_split(source_pane, new_pane, direction)
     
+    @pyqtSlot(object, str, object, int)
     def _handle_tab_split(self, source_pane, direction, source_tab_widget, tab_index):
         """Handle a split request from dragging a tab."""
         if not self._is_split:
@@ -289,12 +308,20 @@ class SplitViewManager(QWidget):
                 self.store_original_size(window.size())
         
         tab = source_tab_widget._tabs[tab_index] if 0 <= tab_index < len(source_tab_widget._tabs) else None
-        if not tab:
+        # A tab still streaming its file would be copied half loaded but
+        # bound to the real path, so saving the copy would truncate the file
+        if not tab or tab.loader is not None:
+            return
+        # Moving a pane's only tab beside that pane would close the pane
+        # under the split; the layout would end up just as it is now
+        if (source_tab_widget is source_pane.tab_widget and
+                source_tab_widget.count() == 1 and len(self._panes) > 1):
             return
         
         content = tab.editor.toPlainText()
         file_path = tab.document.file_path
         is_modified = tab.document.is_modified
+        has_bom = tab.document.has_bom
         
         new_pane = self._create_pane()
         self._panes.append(new_pane)
@@ -303,10 +330,17 @@ class SplitViewManager(QWidget):
         new_tab.editor.setPlainText(content)
         new_tab.document.file_path = file_path
         new_tab.document.is_modified = is_modified
+        new_tab.document.has_bom = has_bom
+        if not is_modified:
+            new_pane.tab_widget._watch_for_edits(new_tab)
         new_pane.tab_widget._update_tab_title(new_tab)
         
         source_tab_widget._close_tab(tab)
         
+        self._insert_split(source_pane, new_pane, direction)
+    
+    def _insert_split(self, source_pane, new_pane, direction):
+        """Replace source_pane with a splitter holding it and new_pane."""
         if direction in ('left', 'right'):
             orientation = Qt.Orientation.Horizontal
             total_size = source_pane.width()
@@ -319,30 +353,25 @@ class SplitViewManager(QWidget):
         splitter = QSplitter(orientation)
         self._splitters.append(splitter)
         
+        # Look up where the pane lives once, before detaching it
         parent = source_pane.parent()
-        if isinstance(parent, QSplitter):
+        in_splitter = isinstance(parent, QSplitter)
+        if in_splitter:
             index = parent.indexOf(source_pane)
-            source_pane.setParent(None)
-            
-            if direction in ('left', 'top'):
-                splitter.addWidget(new_pane)
-                splitter.addWidget(source_pane)
-            else:
-                splitter.addWidget(source_pane)
-                splitter.addWidget(new_pane)
-            
-            parent.insertWidget(index, splitter)
         else:
             self._main_layout.removeWidget(source_pane)
-            source_pane.setParent(None)
-            
-            if direction in ('left', 'top'):
-                splitter.addWidget(new_pane)
-                splitter.addWidget(source_pane)
-            else:
-                splitter.addWidget(source_pane)
-                splitter.addWidget(new_pane)
-            
+        source_pane.setParent(None)
+        
+        if direction in ('left', 'top'):
+            splitter.addWidget(new_pane)
+            splitter.addWidget(source_pane)
+        else:
+            splitter.addWidget(source_pane)
+            splitter.addWidget(new_pane)
+        
+        if in_splitter:
+            parent.insertWidget(index, splitter)
+        else:
             self._main_layout.addWidget(splitter)
         
         QTimer.singleShot(0, lambda: splitter.setSizes([half_size, half_size]))
@@ -356,28 +385,24 @@ class SplitViewManager(QWidget):
         self._panes.remove(pane)
         
         parent = pane.parent()
+        if isinstance(parent, QSplitter) and parent.count() == 2:
+            # Lift the surviving sibling into the splitter's place, then
+            # drop the splitter and the closed pane
+            remaining = parent.widget(1 - parent.indexOf(pane))
+            grandparent = parent.parent()
+            if isinstance(grandparent, QSplitter):
+                grandparent.insertWidget(grandparent.indexOf(parent), remaining)
+            else:
+                self._main_layout.addWidget(remaining)
+            
+            parent.setParent(None)
+            if parent in self._splitters:
+                self._splitters.remove(parent)
+            parent.deleteLater()
+        # Detached so nothing can still reach the splitter through the pane
         pane.setParent(None)
         pane.deleteLater()
         
-        if isinstance(parent, QSplitter):
-            if parent.count() == 1:
-                remaining = parent.widget(0)
-                grandparent = parent.parent()
-                
-                if isinstance(grandparent, QSplitter):
-                    index = grandparent.indexOf(parent)
-                    remaining.setParent(None)
-                    parent.setParent(None)
-                    grandparent.insertWidget(index, remaining)
-                else:
-                    remaining.setParent(None)
-                    parent.setParent(None)
-                    self._main_layout.addWidget(remaining)
-                
-                if parent in self._splitters:
-                    self._splitters.remove(parent)
-                parent.deleteLater()
-        
         if len(self._panes) == 1:
             self._is_split = False
             self._restore_original_size()
@@ -385,6 +410,7 @@ class SplitViewManager(QWidget):
         
         return True
     
+    @pyqtSlot(object)
     def _handle_pane_close(self, pane):
         """Handle close request from a pane."""
         self.close_pane(pane)
@@ -1,13 +1,23 @@
 """Tab widget for managing multiple editor tabs."""
 
-from PyQt6.QtWidgets import QTabWidget, QTabBar, QPushButton, QApplication
-from PyQt6.QtCore import pyqtSignal, Qt, QMimeData, QPoint
-from PyQt6.QtGui import QDrag
+import os
+from functools import partial
+
+from PyQt6.QtWidgets import QTabWidget, QTabBar, QApplication, QMessageBox
+from PyQt6.QtCore import pyqtSignal, Qt, QDir, QMimeData, QPoint
+from PyQt6.QtGui import QDrag, QTextCursor
 
 from editor.text_editor import TextEditor
 from editor.document import Document
 from editor.language_detector import LanguageDetector
+from actions.file_actions import (
+    ChunkedFileLoader, LARGE_FILE_THRESHOLD, STREAM_LOAD_THRESHOLD, file_has_bom,
+    read_text_file, save_in_background, split_bom, write_text_file
+)
+
 
+# Lets TAB_STYLE refer to the bundled icons as icons:<name>
+QDir.addSearchPath("icons", os.path.join(os.path.dirname(__file__), "icons"))
 
 TAB_STYLE = """
     QTabWidget::pane {
@@ -39,6 +49,7 @@ TAB_STYLE = """
     }
     QTabBar::close-button {
         subcontrol-position: right;
+        image: url(icons:close.svg);
         border: none;
         background: transparent;
         padding: 2px;
@@ -47,37 +58,37 @@ TAB_STYLE = """
         height: 12px;
     }
     QTabBar::close-button:hover {
+        image: url(icons:close-hover.svg);
         background-color: #555;
         border-radius: 2px;
     }
 """
 
 
+def _stop_loader(loader):
+    """Disconnect a ChunkedFileLoader and wait for its thread to exit."""
+    for signal in (loader.chunk_loaded, loader.load_failed, loader.finished):
+        signal.disconnect()
+    loader.requestInterruption()
+    loader.wait()
+
+
+def _stop_all_loaders(tabs):
+    """Stop the loads of a TabWidget's tabs when the widget is destroyed."""
+    for tab in tabs:
+        if tab.loader is not None:
+            loader, tab.loader = tab.loader, None
+            _stop_loader(loader)
+
+
 class EditorTab:
     """Container for an editor and its associated document."""
     
     def __init__(self):
         self.editor = TextEditor()
         self.document = Document()
-
-
-CLOSE_BTN_STYLE = """
-    QPushButton {
-        background: transparent;
-        color: #888;
-        border: none;
-        font-family: monospace;
-        font-size: 14px;
-        font-weight: bold;
-        padding: 0px 4px;
-        margin: 0px;
-    }
-    QPushButton:hover {
-        color: #fff;
-        background-color: #555;
-        border-radius: 2px;
-    }
-"""
+        self.loader = None  # ChunkedFileLoader while a large file streams in
+        self.text_changed_connection = None  # set while waiting for the first edit
 
 
 class DraggableTabBar(QTabBar):
@@ -89,6 +100,8 @@ class DraggableTabBar(QTabBar):
         super().__init__(parent)
         self._drag_start_pos = None
         self._dragging = False
+        # Read once rather than on every mouse move
+        self._drag_distance = QApplication.startDragDistance()
     
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -104,7 +117,7 @@ class DraggableTabBar(QTabBar):
             return
         
         distance = (event.position().toPoint() - self._drag_start_pos).manhattanLength()
-        if distance < QApplication.startDragDistance():
+        if distance < self._drag_distance:
             super().mouseMoveEvent(event)
             return
         
@@ -145,26 +158,33 @@ class TabWidget(QTabWidget):
         self._tab_bar = DraggableTabBar(self)
         self.setTabBar(self._tab_bar)
         
-        self.setStyleSheet(TAB_STYLE)
-        self.setTabsClosable(False)
+        # TAB_STYLE is applied once by the SplitViewManager that hosts every
+        # TabWidget, rather than re-parsed for each new pane
+        # Qt's own close buttons, styled by QTabBar::close-button in TAB_STYLE
+        self.setTabsClosable(True)
         self.setMovable(True)
         
         self._tabs = []
+        self._tab_index = {}  # tab -> its index in _tabs and in the tab bar
         
-        self.currentChanged.connect(self._on_current_changed)
+        # Relayed signal to signal, without a Python slot in between
+        self.currentChanged.connect(self.current_document_changed)
+        self.tabCloseRequested.connect(self._on_tab_close_requested)
+        self._tab_bar.tabMoved.connect(self._on_tab_moved)
+        # A pane can be deleted with loads still running; the slot must not
+        # reference self, which is gone by the time destroyed is delivered
+        self.destroyed.connect(partial(_stop_all_loaders, self._tabs))
         
         # Create initial tab
         self.new_tab()
     
-    def new_tab(self, file_path=None):
-        """Create a new editor tab."""
+    def new_tab(self, file_path=None, make_current=True):
+        """Create a new editor tab, opened in the background unless make_current."""
         tab = EditorTab()
         
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                tab.editor.setPlainText(content)
+                self._load_file(tab, file_path)
                 tab.document.file_path = file_path
                 tab.document.is_modified = False
                 language = LanguageDetector.detect_language(file_path)
@@ -174,24 +194,85 @@ class TabWidget(QTabWidget):
         
         self._tabs.append(tab)
         index = self.addTab(tab.editor, tab.document.display_name)
-        self.setCurrentIndex(index)
-        
-        # Add custom close button
-        close_btn = QPushButton("×")
-        close_btn.setStyleSheet(CLOSE_BTN_STYLE)
-        close_btn.setFixedSize(18, 18)
-        close_btn.clicked.connect(lambda _, t=tab: self._close_tab(t))
-        self.tabBar().setTabButton(index, QTabBar.ButtonPosition.RightSide, close_btn)
+        self._tab_index[tab] = index
+        if make_current:
+            self.setCurrentIndex(index)
         
-        # Connect text changed to update tab title
-        tab.editor.textChanged.connect(lambda: self._on_text_changed(tab))
+        self._watch_for_edits(tab)
         
         return tab
     
+    def _load_file(self, tab, file_path):
+        """Load a file into a tab, streaming large files in the background."""
+        if os.path.getsize(file_path) <= STREAM_LOAD_THRESHOLD:
+            text, tab.document.has_bom = split_bom(read_text_file(file_path))
+            tab.editor.setPlainText(text)
+            return
+        
+        # Show the first chunk as soon as it arrives; keep the editor
+        # read-only until the rest of the file has been appended
+        tab.document.has_bom = file_has_bom(file_path)
+        tab.editor.clear()
+        tab.editor.setReadOnly(True)
+        tab.editor.setUndoRedoEnabled(False)
+        tab.loader = ChunkedFileLoader(file_path)
+        tab.loader.chunk_loaded.connect(partial(self._append_chunk, tab))
+        tab.loader.load_failed.connect(partial(self._on_load_failed, tab))
+        tab.loader.finished.connect(partial(self._on_load_finished, tab))
+        tab.loader.start()
+    
+    def _append_chunk(self, tab, chunk):
+        """Append a chunk of a streaming file to the end of the tab's editor."""
+        cursor = QTextCursor(tab.editor.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(chunk)
+    
+    def _on_load_failed(self, tab, error):
+        """Warn that a streamed file couldn't be read to the end, then detach it."""
+        QMessageBox.warning(
+            self,
+            "Error",
+            f"Could not finish loading {tab.document.display_name}:\n{error}\n\n"
+            "The text loaded so far is kept as an untitled document."
+        )
+        self._detach_from_file(tab)
+    
+    def _detach_from_file(self, tab):
+        """Detach a partially loaded tab from its file so it can't overwrite it."""
+        tab.document.file_path = None
+        self._update_tab_title(tab)
+        self.current_document_changed.emit()
+    
+    def _on_load_finished(self, tab):
+        """Make a streamed tab editable once its file has been fully read."""
+        tab.loader = None
+        tab.editor.setReadOnly(False)
+        tab.editor.setUndoRedoEnabled(True)
+        self.current_document_changed.emit()
+    
+    def _cancel_load(self, tab):
+        """Stop a tab's background load and detach the partial text from its file."""
+        loader, tab.loader = tab.loader, None
+        _stop_loader(loader)
+        tab.editor.setReadOnly(False)
+        tab.editor.setUndoRedoEnabled(True)
+        self._detach_from_file(tab)
+    
+    def _watch_for_edits(self, tab):
+        """Listen for the edit that next makes a clean tab modified."""
+        if tab.text_changed_connection is None:
+            tab.text_changed_connection = tab.editor.textChanged.connect(
+                partial(self._on_text_changed, tab)
+            )
+    
     def _on_text_changed(self, tab):
-        """Update tab title when content changes."""
-        if tab not in self._tabs:
+        """Flag the tab as modified on its first edit, then stop listening."""
+        if tab.loader is not None:
             return
+        # Once modified, further keystrokes change nothing until the tab is
+        # saved, so drop the connection rather than running Python per key
+        tab.editor.textChanged.disconnect(tab.text_changed_connection)
+        tab.text_changed_connection = None
         if not tab.document.is_modified:
             tab.document.is_modified = True
             self._update_tab_title(tab)
@@ -199,31 +280,49 @@ class TabWidget(QTabWidget):
     
     def _update_tab_title(self, tab):
         """Update the tab title to reflect document state."""
-        if tab not in self._tabs:
+        index = self._tab_index.get(tab)
+        if index is None:
             return
-        index = self._tabs.index(tab)
         title = tab.document.display_name
         if tab.document.is_modified:
             title += " *"
-        self.setTabText(index, title)
+        # setTabText relayouts the tab bar even when the text is unchanged
+        if self.tabText(index) != title:
+            self.setTabText(index, title)
+    
+    def _on_tab_close_requested(self, index):
+        """Close the tab whose close button was clicked."""
+        self._close_tab(self._tabs[index])
     
     def _close_tab(self, tab):
         """Close a specific tab safely."""
-        if tab not in self._tabs:
+        if tab not in self._tab_index:
             return
         
+        # Stop loading first: closing the last tab may delete the whole
+        # pane, and a last tab that is kept must not hold a partial file
+        if tab.loader is not None:
+            self._cancel_load(tab)
+        
         if self.count() <= 1:
             # Signal that the last tab is being closed (for split view handling)
             self.last_tab_closed.emit()
             return
         
-        index = self._tabs.index(tab)
-        self._tabs.pop(index)
+        index = self._tab_index.pop(tab)
+        del self._tabs[index]
+        for later in self._tabs[index:]:
+            self._tab_index[later] -= 1
         self.removeTab(index)
+        # removeTab leaves the page parented to the tab widget, which would
+        # keep every closed editor (and its document) alive with the pane
+        tab.editor.deleteLater()
     
-    def _on_current_changed(self, index):
-        """Handle tab change."""
-        self.current_document_changed.emit()
+    def _on_tab_moved(self, from_index, to_index):
+        """Keep _tabs in tab bar order when the user drags a tab along it."""
+        self._tabs.insert(to_index, self._tabs.pop(from_index))
+        for index in range(min(from_index, to_index), max(from_index, to_index) + 1):
+            self._tab_index[self._tabs[index]] = index
     
     def current_tab(self):
         """Get the current tab."""
@@ -244,7 +343,7 @@ class TabWidget(QTabWidget):
         tab = self.current_tab()
         return tab.document if tab else None
     
-    def open_file(self, file_path):
+    def open_file(self, file_path, make_current=True):
         """Open a file in a new tab (or current if empty and unmodified)."""
         current = self.current_tab()
         
@@ -254,11 +353,10 @@ class TabWidget(QTabWidget):
             current.document.file_path is None and
             not current.editor.toPlainText()):
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                current.editor.setPlainText(content)
+                self._load_file(current, file_path)
                 current.document.file_path = file_path
                 current.document.is_modified = False
+                self._watch_for_edits(current)
                 language = LanguageDetector.detect_language(file_path)
                 current.editor.set_syntax_language(language)
                 self._update_tab_title(current)
@@ -268,27 +366,84 @@ class TabWidget(QTabWidget):
                 return False
         
         # Otherwise create new tab
-        tab = self.new_tab(file_path)
+        tab = self.new_tab(file_path, make_current)
         return tab is not None
     
+    def open_files(self, file_paths):
+        """Open several files, relaying out and notifying listeners only once.
+        
+        Only the last file's tab is made current, so the others stay hidden
+        and skip highlighting until they are first shown.
+        
+        Returns True if every file was opened.
+        """
+        count = self.count()
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            results = [
+                self.open_file(file_path, make_current=False) for file_path in file_paths
+            ]
+            # Only the first file can reuse the current tab, so if any tab
+            # was added the last one holds the last file
+            if self.count() > count:
+                self.setCurrentIndex(self.count() - 1)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+        self.current_document_changed.emit()
+        return all(results)
+    
+    def modified_tabs(self):
+        """Get the tabs that have unsaved changes."""
+        return [tab for tab in self._tabs if tab.document.is_modified]
+    
     def save_current(self):
         """Save the current tab's file."""
-        tab = self.current_tab()
+        return self.save_tab(self.current_tab())
+    
+    def save_tab(self, tab, background=True):
+        """Save a tab's file to its existing path.
+        
+        Large documents are written on a worker thread unless background is
+        False, in which case the result is known when this returns.
+        """
         if not tab:
             return False
         
         if tab.document.file_path is None:
             return False
         
-        try:
-            with open(tab.document.file_path, "w", encoding="utf-8") as f:
-                f.write(tab.editor.toPlainText())
-            tab.document.is_modified = False
+        # The editor holds only the part of the file read so far
+        if tab.loader is not None:
+            return False
+        
+        # The text must be read on the UI thread; large documents are then
+        # written in the background so the editor stays responsive
+        text = tab.editor.toPlainText()
+        if background and len(text) > LARGE_FILE_THRESHOLD:
+            save_in_background(
+                tab.document.file_path, text, partial(self._on_save_finished, tab),
+                tab.document.has_bom
+            )
+        else:
+            try:
+                write_text_file(tab.document.file_path, text, tab.document.has_bom)
+            except Exception:
+                return False
+        
+        tab.document.is_modified = False
+        self._watch_for_edits(tab)
+        self._update_tab_title(tab)
+        self.current_document_changed.emit()
+        return True
+    
+    def _on_save_finished(self, tab, error):
+        """Flag a tab as modified again if its background save failed."""
+        if error and tab in self._tab_index:
+            tab.document.is_modified = True
             self._update_tab_title(tab)
             self.current_document_changed.emit()
-            return True
-        except Exception:
-            return False
     
     def mark_current_saved(self, file_path):
         """Mark current tab as saved with given path."""
@@ -296,6 +451,7 @@ class TabWidget(QTabWidget):
         if tab:
             tab.document.file_path = file_path
             tab.document.is_modified = False
+            self._watch_for_edits(tab)
             language = LanguageDetector.detect_language(file_path)
             tab.editor.set_syntax_language(language)
             self._update_tab_title(tab)
@@ -13,6 +13,14 @@ class TestDocument:
         document.file_path = "/home/user/test.txt"
         assert document.display_name == "test.txt"
     
+    def test_display_name_follows_path_changes(self, document):
+        document.file_path = "/home/user/a.py"
+        document.file_path = "/home/user/b.py"
+        assert document.display_name == "b.py"
+        
+        document.reset()
+        assert document.display_name == "Untitled"
+    
     def test_modified_state(self, document):
         document.is_modified = True
         assert document.is_modified is True
@@ -20,8 +28,10 @@ class TestDocument:
     def test_reset(self, document):
         document.file_path = "/some/path.txt"
         document.is_modified = True
+        document.has_bom = True
         
         document.reset()
         
         assert document.file_path is None
         assert document.is_modified is False
+        assert document.has_bom is False
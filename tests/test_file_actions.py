@@ -1,7 +1,8 @@
 """Tests for file operations."""
 
-import tempfile
-import os
+import pytest
+
+from actions.file_actions import read_text_file, write_text_file
 
 
 class TestNewFile:
@@ -24,19 +25,15 @@ class TestNewFile:
 
 
 class TestOpenFile:
-    def test_open_file_loads_content(self, main_window):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("test content")
-            temp_path = f.name
-        
-        try:
-            main_window.file_actions.open_file(temp_path)
-            
-            assert main_window.editor.toPlainText() == "test content"
-            assert main_window.document.file_path == temp_path
-            assert main_window.document.is_modified is False
-        finally:
-            os.unlink(temp_path)
+    def test_open_file_loads_content(self, main_window, tmp_path):
+        temp_path = tmp_path / "test.txt"
+        temp_path.write_text("test content")
+        
+        main_window.file_actions.open_file(str(temp_path))
+        
+        assert main_window.editor.toPlainText() == "test content"
+        assert main_window.document.file_path == str(temp_path)
+        assert main_window.document.is_modified is False
     
     def test_open_nonexistent_file_returns_false(self, main_window):
         result = main_window.file_actions.open_file("/nonexistent/path.txt")
@@ -44,35 +41,290 @@ class TestOpenFile:
 
 
 class TestSaveFile:
-    def test_save_file_writes_content(self, main_window):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            temp_path = f.name
-        
-        try:
-            main_window.editor.setPlainText("saved content")
-            main_window.document.file_path = temp_path
-            main_window.document.is_modified = True
-            
-            result = main_window.file_actions.save_file()
-            
-            assert result is True
-            assert main_window.document.is_modified is False
-            
-            with open(temp_path, "r") as f:
-                assert f.read() == "saved content"
-        finally:
-            os.unlink(temp_path)
-    
-    def test_save_preserves_file_path(self, main_window):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            temp_path = f.name
-        
-        try:
-            main_window.editor.setPlainText("content")
-            main_window.document.file_path = temp_path
-            
-            main_window.file_actions.save_file()
-            
-            assert main_window.document.file_path == temp_path
-        finally:
-            os.unlink(temp_path)
+    def test_save_file_writes_content(self, main_window, tmp_path):
+        temp_path = tmp_path / "test.txt"
+        
+        main_window.editor.setPlainText("saved content")
+        main_window.document.file_path = str(temp_path)
+        main_window.document.is_modified = True
+        
+        result = main_window.file_actions.save_file()
+        
+        assert result is True
+        assert main_window.document.is_modified is False
+        assert temp_path.read_text() == "saved content"
+    
+    def test_save_preserves_file_path(self, main_window, tmp_path):
+        temp_path = str(tmp_path / "test.txt")
+        
+        main_window.editor.setPlainText("content")
+        main_window.document.file_path = temp_path
+        
+        main_window.file_actions.save_file()
+        
+        assert main_window.document.file_path == temp_path
+    
+    def test_edit_after_save_marks_modified_again(self, main_window, tmp_path):
+        path = tmp_path / "edit.txt"
+        path.write_text("one")
+        main_window.file_actions.open_file(str(path))
+        tab = main_window.tab_widget.current_tab()
+        
+        main_window.editor.insertPlainText("two")
+        assert main_window.document.is_modified is True
+        assert tab.text_changed_connection is None
+        
+        main_window.file_actions.save_file()
+        assert main_window.document.is_modified is False
+        
+        main_window.editor.insertPlainText("three")
+        assert main_window.document.is_modified is True
+        assert main_window.tab_widget.tabText(0) == "edit.txt *"
+        
+        main_window.document.is_modified = False
+
+
+class TestFileIO:
+    def test_write_then_read_round_trip(self, tmp_path):
+        path = str(tmp_path / "unicode.txt")
+        write_text_file(path, "héllo\nwörld")
+        assert read_text_file(path) == "héllo\nwörld"
+    
+    def test_write_in_chunks_round_trip(self, tmp_path, monkeypatch):
+        import actions.file_actions
+        monkeypatch.setattr(actions.file_actions, "WRITE_CHUNK_SIZE", 3)
+        path = tmp_path / "chunks.txt"
+        path.write_bytes(b"caf\xe9 h\xc3\xa9llo\n")
+        
+        write_text_file(str(path), read_text_file(str(path)))
+        
+        assert path.read_bytes() == b"caf\xe9 h\xc3\xa9llo\n"
+    
+    def test_invalid_utf8_bytes_survive_round_trip(self, tmp_path):
+        path = tmp_path / "latin1.txt"
+        path.write_bytes(b"caf\xe9\n")
+        write_text_file(str(path), read_text_file(str(path)))
+        assert path.read_bytes() == b"caf\xe9\n"
+    
+    def test_crlf_is_normalized_and_bom_kept(self, tmp_path):
+        path = tmp_path / "bom.txt"
+        path.write_bytes(b"\xef\xbb\xbfone\r\ntwo")
+        assert read_text_file(str(path)) == "\ufeffone\ntwo"
+    
+    def test_bom_survives_round_trip(self, tmp_path):
+        path = tmp_path / "bom.txt"
+        path.write_bytes(b"\xef\xbb\xbfone\ntwo")
+        write_text_file(str(path), read_text_file(str(path)))
+        assert path.read_bytes() == b"\xef\xbb\xbfone\ntwo"
+    
+    def test_read_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            read_text_file(str(tmp_path / "missing.txt"))
+
+
+class TestLargeFileLoading:
+    def test_large_file_streams_in_chunks(self, main_window, tmp_path, qtbot, monkeypatch):
+        import ui.tab_widget
+        import actions.file_actions
+        monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+        monkeypatch.setattr(actions.file_actions, "LOAD_CHUNK_SIZE", 8)
+        temp_path = tmp_path / "large.txt"
+        content = "line of text\n" * 50
+        temp_path.write_text(content)
+        
+        main_window.file_actions.open_file(str(temp_path))
+        tab = main_window.tab_widget.current_tab()
+        qtbot.waitUntil(lambda: tab.loader is None)
+        
+        assert main_window.editor.toPlainText() == content
+        assert main_window.editor.isReadOnly() is False
+        assert main_window.document.file_path == str(temp_path)
+        assert main_window.document.is_modified is False
+    
+    def test_opened_file_keeps_bom_on_save(self, main_window, tmp_path):
+        temp_path = tmp_path / "bom.txt"
+        temp_path.write_bytes(b"\xef\xbb\xbfone\ntwo")
+        main_window.file_actions.open_file(str(temp_path))
+        
+        assert main_window.editor.toPlainText() == "one\ntwo"
+        main_window.editor.appendPlainText("three")
+        assert main_window.file_actions.save_file() is True
+        assert temp_path.read_bytes() == b"\xef\xbb\xbfone\ntwo\nthree"
+    
+    def test_streamed_file_keeps_bom_on_save(self, main_window, tmp_path, qtbot, monkeypatch):
+        import ui.tab_widget
+        import actions.file_actions
+        monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+        monkeypatch.setattr(actions.file_actions, "LOAD_CHUNK_SIZE", 8)
+        temp_path = tmp_path / "bom.txt"
+        data = b"\xef\xbb\xbf" + b"line of text\n" * 50
+        temp_path.write_bytes(data)
+        
+        main_window.file_actions.open_file(str(temp_path))
+        tab = main_window.tab_widget.current_tab()
+        qtbot.waitUntil(lambda: tab.loader is None)
+        
+        assert main_window.file_actions.save_file() is True
+        assert temp_path.read_bytes() == data
+    
+    def test_save_during_load_leaves_file_intact(self, main_window, tmp_path, monkeypatch):
+        import ui.tab_widget
+        import actions.file_actions
+        from PyQt6.QtWidgets import QFileDialog
+        monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+        monkeypatch.setattr(actions.file_actions, "LOAD_CHUNK_SIZE", 8)
+        dialogs = []
+        monkeypatch.setattr(
+            QFileDialog, "getSaveFileName", lambda *args, **kwargs: dialogs.append(args)
+        )
+        temp_path = tmp_path / "large.txt"
+        content = "line of text\n" * 2000
+        temp_path.write_text(content)
+        main_window.file_actions.open_file(str(temp_path))
+        tab = main_window.tab_widget.current_tab()
+        actions = main_window.actions
+        
+        assert tab.loader is not None
+        assert not actions["save"].isEnabled()
+        assert not actions["save_as"].isEnabled()
+        assert main_window.file_actions.save_file() is False
+        assert main_window.file_actions.save_file_as() is False
+        assert dialogs == []
+        tab.loader.wait()
+        assert temp_path.read_text() == content
+    
+    def test_file_over_stream_threshold_cannot_be_truncated(self, main_window, tmp_path):
+        from actions.file_actions import LARGE_FILE_THRESHOLD, STREAM_LOAD_THRESHOLD
+        temp_path = tmp_path / "large.txt"
+        line = "line of text\n"
+        content = line * (2 * STREAM_LOAD_THRESHOLD // len(line))
+        assert STREAM_LOAD_THRESHOLD < len(content) < LARGE_FILE_THRESHOLD
+        temp_path.write_text(content)
+        
+        main_window.file_actions.open_file(str(temp_path))
+        tab = main_window.tab_widget.current_tab()
+        
+        assert tab.loader is not None
+        assert main_window.file_actions.save_file() is False
+        tab.loader.wait()
+        assert temp_path.read_text() == content
+    
+    def test_save_enabled_once_loaded(self, main_window, tmp_path, qtbot, monkeypatch):
+        import ui.tab_widget
+        monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+        temp_path = tmp_path / "large.txt"
+        temp_path.write_text("line of text\n" * 50)
+        main_window.file_actions.open_file(str(temp_path))
+        tab = main_window.tab_widget.current_tab()
+        
+        qtbot.waitUntil(lambda: tab.loader is None)
+        
+        assert main_window.actions["save"].isEnabled()
+        assert main_window.actions["save_as"].isEnabled()
+        assert main_window.file_actions.save_file() is True
+    
+    def test_large_file_saves_in_background(self, main_window, tmp_path, qtbot, monkeypatch):
+        import ui.tab_widget
+        monkeypatch.setattr(ui.tab_widget, "LARGE_FILE_THRESHOLD", 10)
+        temp_path = tmp_path / "large.txt"
+        content = "line of text\n" * 50
+        
+        main_window.editor.setPlainText(content)
+        main_window.document.file_path = str(temp_path)
+        main_window.document.is_modified = True
+        
+        assert main_window.file_actions.save_file() is True
+        qtbot.waitUntil(lambda: temp_path.exists() and temp_path.read_text() == content)
+        assert main_window.document.is_modified is False
+    
+    def test_background_saves_commit_in_order(self, main_window, tmp_path, monkeypatch):
+        import ui.tab_widget
+        from actions.file_actions import wait_for_background_saves
+        monkeypatch.setattr(ui.tab_widget, "LARGE_FILE_THRESHOLD", 10)
+        temp_path = tmp_path / "large.txt"
+        main_window.document.file_path = str(temp_path)
+        
+        for i in range(20):
+            main_window.editor.setPlainText(f"revision {i}\n" * 50)
+            assert main_window.file_actions.save_file() is True
+        wait_for_background_saves()
+        
+        assert temp_path.read_text() == "revision 19\n" * 50
+
+
+class TestCloseWithUnsavedTabs:
+    def test_single_prompt_saves_all_modified_tabs(self, main_window, tmp_path, monkeypatch):
+        from PyQt6.QtWidgets import QMessageBox
+        prompts = []
+        
+        def fake_question(*args):
+            prompts.append(args)
+            return QMessageBox.StandardButton.Save
+        
+        monkeypatch.setattr(QMessageBox, "question", fake_question)
+        tab_widget = main_window.tab_widget
+        paths = [tmp_path / "a.txt", tmp_path / "b.txt"]
+        for path in paths:
+            tab = tab_widget.new_tab()
+            tab.editor.setPlainText(path.name)
+            tab.document.file_path = str(path)
+        
+        assert main_window.file_actions._check_all_unsaved_changes() is True
+        
+        assert len(prompts) == 1
+        assert [path.read_text() for path in paths] == ["a.txt", "b.txt"]
+        assert tab_widget.modified_tabs() == []
+    
+    def test_cancel_keeps_window_open(self, main_window, monkeypatch):
+        from PyQt6.QtWidgets import QMessageBox
+        monkeypatch.setattr(
+            QMessageBox, "question", lambda *args: QMessageBox.StandardButton.Cancel
+        )
+        main_window.editor.setPlainText("unsaved")
+        
+        assert main_window.file_actions._check_all_unsaved_changes() is False
+        
+        main_window.document.is_modified = False
+    
+    def test_save_on_close_writes_large_files_before_returning(
+        self, main_window, tmp_path, monkeypatch
+    ):
+        import ui.tab_widget
+        from PyQt6.QtWidgets import QMessageBox
+        monkeypatch.setattr(ui.tab_widget, "LARGE_FILE_THRESHOLD", 10)
+        monkeypatch.setattr(
+            QMessageBox, "question", lambda *args: QMessageBox.StandardButton.Save
+        )
+        temp_path = tmp_path / "large.txt"
+        content = "line of text\n" * 50
+        main_window.editor.setPlainText(content)
+        main_window.document.file_path = str(temp_path)
+        
+        assert main_window.file_actions._check_all_unsaved_changes() is True
+        assert temp_path.read_text() == content
+    
+    def test_failed_background_save_is_caught_on_close(
+        self, main_window, tmp_path, monkeypatch
+    ):
+        import ui.tab_widget
+        from PyQt6.QtGui import QCloseEvent
+        from PyQt6.QtWidgets import QMessageBox
+        prompts = []
+        
+        def fake_question(*args):
+            prompts.append(args)
+            return QMessageBox.StandardButton.Cancel
+        
+        monkeypatch.setattr(ui.tab_widget, "LARGE_FILE_THRESHOLD", 10)
+        monkeypatch.setattr(QMessageBox, "question", fake_question)
+        main_window.editor.setPlainText("line of text\n" * 50)
+        main_window.document.file_path = str(tmp_path / "missing" / "large.txt")
+        assert main_window.file_actions.save_file() is True
+        
+        event = QCloseEvent()
+        main_window.closeEvent(event)
+        
+        assert not event.isAccepted()
+        assert len(prompts) == 1
+        assert main_window.document.is_modified is True
+        main_window.document.is_modified = False
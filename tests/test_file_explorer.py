@@ -0,0 +1,34 @@
+"""Tests for FileExplorer."""
+
+import pytest
+
+from ui.file_explorer import FileExplorer
+
+
+@pytest.fixture
+def explorer(qtbot):
+    """Create a FileExplorer widget."""
+    widget = FileExplorer()
+    qtbot.addWidget(widget)
+    return widget
+
+
+class TestFileExplorer:
+    def test_tree_not_built_until_folder_opened(self, explorer):
+        assert explorer.tree is None
+        assert explorer.model is None
+        assert explorer.stack.count() == 1
+
+    def test_set_root_path_builds_tree(self, explorer, tmp_path):
+        explorer.set_root_path(str(tmp_path))
+        assert explorer.tree is not None
+        assert explorer.stack.currentIndex() == 1
+        assert explorer.root_path() == str(tmp_path)
+
+    def test_reopening_folder_reuses_tree(self, explorer, tmp_path):
+        explorer.set_root_path(str(tmp_path))
+        tree = explorer.tree
+        explorer.close_folder()
+        explorer.set_root_path(str(tmp_path))
+        assert explorer.tree is tree
+        assert explorer.stack.count() == 2
@@ -1,7 +1,7 @@
 """Tests for split view functionality."""
 
 import pytest
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QPoint, QRect, QSize
 
 
 @pytest.fixture
@@ -87,6 +87,116 @@ class TestSplitViewManager:
         
         assert split_view_manager.split_count() == 1
         assert not split_view_manager.is_split
+    
+    def test_nested_split_keeps_pane_order(self, split_view_manager, tmp_path):
+        """Splitting a pane inside a splitter puts the new pane on the requested side."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        first = split_view_manager._panes[0]
+        split_view_manager._handle_split(first, 'right', str(test_file))
+        split_view_manager._handle_split(first, 'top', str(test_file))
+        
+        outer = split_view_manager._splitters[0]
+        inner = split_view_manager._splitters[1]
+        assert outer.indexOf(inner) == 0
+        assert inner.widget(0) is split_view_manager._panes[2]
+        assert inner.widget(1) is first
+    
+    def test_tab_split_releases_source_editor(self, split_view_manager, qtbot):
+        """The editor of a tab dragged into a new pane is deleted, not kept hidden."""
+        from PyQt6 import sip
+        source = split_view_manager._panes[0]
+        source.tab_widget.new_tab()
+        moved_editor = source.tab_widget.current_editor
+        
+        split_view_manager._handle_tab_split(source, 'right', source.tab_widget, 1)
+        
+        qtbot.waitUntil(lambda: sip.isdeleted(moved_editor))
+        assert source.tab_widget.count() == 1
+    
+    def test_tab_still_loading_is_not_split(self, split_view_manager, tmp_path, monkeypatch):
+        """A half-loaded tab can't be copied into a new pane under its real path."""
+        import ui.tab_widget
+        import actions.file_actions
+        monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+        monkeypatch.setattr(actions.file_actions, "LOAD_CHUNK_SIZE", 8)
+        test_file = tmp_path / "large.txt"
+        test_file.write_text("line of text\n" * 2000)
+        source = split_view_manager._panes[0]
+        source.tab_widget.new_tab(str(test_file))
+        tab = source.tab_widget.current_tab()
+        
+        split_view_manager._handle_tab_split(source, 'right', source.tab_widget, 1)
+        
+        assert split_view_manager.split_count() == 1
+        assert source.tab_widget._tabs[1] is tab
+    
+    @pytest.mark.parametrize("direction", ['left', 'right', 'top', 'bottom'])
+    def test_only_tab_dropped_on_own_pane_is_kept(
+        self, split_view_manager, qtbot, tmp_path, direction
+    ):
+        """Dropping a split pane's only tab onto that pane leaves it in place."""
+        from PyQt6 import sip
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        split_view_manager._handle_split(split_view_manager._panes[0], 'right', str(test_file))
+        pane = split_view_manager._panes[1]
+        tab = pane.tab_widget.current_tab()
+        tab.editor.setPlainText("unsaved text")
+        
+        split_view_manager._handle_tab_split(pane, direction, pane.tab_widget, 0)
+        qtbot.wait(10)
+        
+        assert split_view_manager.split_count() == 2
+        assert not any(sip.isdeleted(p) for p in split_view_manager._panes)
+        assert pane.tab_widget.current_tab() is tab
+        assert tab.editor.toPlainText() == "unsaved text"
+    
+    def test_tab_widget_fills_pane(self, split_view_manager, qtbot, tmp_path):
+        """Each pane's tab widget covers the whole pane, before and after a split."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        split_view_manager.resize(800, 600)
+        split_view_manager.show()
+        qtbot.waitExposed(split_view_manager)
+        
+        split_view_manager._handle_split(split_view_manager._panes[0], 'right', str(test_file))
+        qtbot.wait(10)
+        
+        for pane in split_view_manager._panes:
+            assert pane.width() > 0
+            assert pane.tab_widget.geometry() == pane.rect()
+    
+    def test_close_nested_pane_collapses_splitter(self, split_view_manager, qtbot, tmp_path):
+        """Closing a pane deletes it with its splitter and lifts its sibling up."""
+        from PyQt6 import sip
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        first = split_view_manager._panes[0]
+        split_view_manager._handle_split(first, 'right', str(test_file))
+        split_view_manager._handle_split(first, 'bottom', str(test_file))
+        outer, inner = split_view_manager._splitters
+        closed = split_view_manager._panes[2]
+        
+        split_view_manager.close_pane(closed)
+        
+        assert outer.indexOf(first) == 0
+        assert split_view_manager._splitters == [outer]
+        qtbot.waitUntil(lambda: sip.isdeleted(inner))
+        assert sip.isdeleted(closed)
+    
+    def test_tab_style_applied_once_for_all_panes(self, split_view_manager, tmp_path):
+        """Panes inherit the tab style from the manager instead of setting their own."""
+        from ui.tab_widget import TAB_STYLE
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        split_view_manager._handle_split(split_view_manager._panes[0], 'right', str(test_file))
+        
+        assert split_view_manager.styleSheet() == TAB_STYLE
+        assert all(not tw.styleSheet() for tw in split_view_manager.tab_widgets())
 
 
 class TestSplitViewWindowSize:
@@ -185,6 +295,7 @@ class TestClosingLastTabClosesSplitPane:
         
         assert split_view_manager.split_count() == 1
         assert not split_view_manager.is_split
+        assert new_pane.parent() is None
     
     def test_closing_last_tab_restores_original_size(self, main_window, tmp_path, qtbot):
         """Closing last tab in split pane restores original window size."""
@@ -367,3 +478,103 @@ class TestDropZones:
         left_rect = overlay.get_zone_rect('left')
         assert left_rect.width() == 200
         assert left_rect.height() == 400
+
+
+@pytest.fixture
+def overlay(qtbot):
+    """Create a 200x100 DropZoneOverlay."""
+    from ui.split_view import DropZoneOverlay
+    widget = DropZoneOverlay()
+    widget.resize(200, 100)
+    qtbot.addWidget(widget)
+    return widget
+
+
+class TestDropZoneOverlay:
+    """Tests for the drop zone overlay."""
+    
+    @pytest.mark.parametrize("zone, rect", [
+        ('top', QRect(0, 0, 201, 51)),
+        ('right', QRect(100, 0, 101, 101)),
+        ('bottom', QRect(0, 50, 201, 51)),
+    ])
+    def test_zone_change_invalidates_only_zone_rects(self, overlay, monkeypatch, zone, rect):
+        """Changing the active zone repaints the old and new zones only."""
+        updates = []
+        monkeypatch.setattr(overlay, "update", updates.append)
+        
+        overlay.set_active_zone(zone)
+        overlay.set_active_zone(zone)
+        
+        assert updates == [rect]
+    
+    def test_clearing_zone_invalidates_only_old_zone(self, overlay, monkeypatch):
+        """Clearing the highlight repaints just the zone that was shown."""
+        overlay.set_active_zone('right')
+        updates = []
+        monkeypatch.setattr(overlay, "update", updates.append)
+        
+        overlay.set_active_zone(None)
+        
+        assert updates == [QRect(100, 0, 101, 101)]
+    
+    def test_zone_change_covers_previous_zone(self, overlay, monkeypatch):
+        """The previous highlight is included so it gets erased."""
+        overlay.set_active_zone('left')
+        updates = []
+        monkeypatch.setattr(overlay, "update", updates.append)
+        
+        overlay.set_active_zone('right')
+        
+        assert updates == [QRect(0, 0, 201, 101)]
+    
+    def test_drag_moves_coalesced_to_latest_position(self, overlay, qtbot):
+        """Only the last of a burst of tracked positions is hit-tested."""
+        overlay.track(QPoint(100, 5))
+        overlay.track(QPoint(5, 50))
+        assert overlay._active_zone is None
+        
+        qtbot.waitUntil(lambda: overlay._active_zone is not None)
+        assert overlay._active_zone == 'left'
+    
+    def test_zone_at_is_nearest_edge(self, overlay):
+        """Each point maps to its nearest edge, ties going top, bottom, left, right."""
+        for x in range(0, 201, 5):
+            for y in range(0, 101, 5):
+                distances = [('top', y), ('bottom', 100 - y), ('left', x), ('right', 200 - x)]
+                nearest = min(distances, key=lambda item: item[1])[0]
+                assert overlay.get_zone_at(QPoint(x, y)) == nearest
+    
+    def test_show_zones_is_idempotent(self, overlay, monkeypatch):
+        """Showing an already shown overlay doesn't raise or repaint it again."""
+        raised = []
+        monkeypatch.setattr(overlay, "raise_", lambda: raised.append(True))
+        overlay.show_zones()
+        overlay.show_zones()
+        assert raised == [True]
+        
+        overlay.hide_zones()
+        overlay.show_zones()
+        assert raised == [True, True]
+    
+    def test_active_zone_painted(self, overlay):
+        """The active zone is filled with the highlight colour."""
+        overlay.show_zones()
+        overlay.set_active_zone('left')
+        image = overlay.grab().toImage()
+        assert image.pixelColor(50, 50).rgb() != image.pixelColor(150, 50).rgb()
+    
+    def test_show_zones_paints_nothing_without_zone(self, overlay):
+        """A freshly shown overlay leaves the area underneath untouched."""
+        overlay.show_zones()
+        image = overlay.grab().toImage()
+        assert image.pixelColor(50, 50) == image.pixelColor(150, 50)
+    
+    def test_zone_rects_follow_resize(self, overlay):
+        """Zone rectangles are reused until the overlay is resized."""
+        assert overlay.get_zone_rect('bottom') == QRect(0, 50, 200, 50)
+        assert overlay.get_zone_rect('bottom') is overlay.get_zone_rect('bottom')
+        
+        overlay.resize(300, 200)
+        assert overlay.get_zone_rect('bottom') == QRect(0, 100, 300, 100)
+        assert overlay.get_zone_rect(None).isEmpty()
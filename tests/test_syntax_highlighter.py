@@ -1,10 +1,12 @@
 """Tests for SyntaxHighlighter."""
 
 import pytest
-from PyQt6.QtGui import QTextDocument
+from PyQt6.QtGui import QTextCursor, QTextDocument, QColor
 
-from editor.syntax_highlighter import SyntaxHighlighter
-from editor.language_definitions import LANGUAGES, TokenType, TOKEN_COLORS
+from editor.syntax_highlighter import REHIGHLIGHT_CHUNK_BLOCKS, SyntaxHighlighter
+from editor.language_definitions import (
+    LANGUAGES, LanguageDefinition, TokenType, TOKEN_COLORS
+)
 
 
 @pytest.fixture
@@ -49,7 +51,7 @@ class TestSyntaxHighlighterInit:
         h, _ = highlighter
         h.set_language("unknown_lang")
         assert h.language == "unknown_lang"
-        assert h._patterns == []
+        assert h._combined is None
 
 
 class TestHighlightingPython:
@@ -76,6 +78,31 @@ class TestHighlightingPython:
         block = doc.begin()
         assert block.isValid()
 
+    def test_hash_inside_string_is_not_comment(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText('x = "a # b"')
+        h.rehighlight()
+        formats = doc.begin().layout().formats()
+        string_color = QColor(TOKEN_COLORS[TokenType.STRING])
+        string_ranges = [
+            (r.start, r.length) for r in formats
+            if r.format.foreground().color() == string_color
+        ]
+        assert (4, 7) in string_ranges
+
+    def test_keyword_inside_triple_quote_not_highlighted(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText('x = """def"""')
+        h.rehighlight()
+        keyword_color = QColor(TOKEN_COLORS[TokenType.KEYWORD])
+        formats = doc.begin().layout().formats()
+        assert not any(
+            r.start >= 4 and r.format.foreground().color() == keyword_color
+            for r in formats
+        )
+
     def test_triple_quote_multiline(self, highlighter):
         h, doc = highlighter
         h.set_language("python")
@@ -106,6 +133,19 @@ class TestHighlightingJavaScript:
         doc.setPlainText("`hello world`")
         assert doc.begin().isValid()
 
+    @pytest.mark.parametrize("text", ["i++// bump", "x =/* bump */ 1"])
+    def test_operator_does_not_swallow_comment(self, highlighter, text):
+        h, doc = highlighter
+        h.set_language("javascript")
+        doc.setPlainText(text)
+        h.rehighlight()
+        comment_color = QColor(TOKEN_COLORS[TokenType.COMMENT])
+        formats = doc.begin().layout().formats()
+        assert any(
+            r.start == text.index("/") and r.format.foreground().color() == comment_color
+            for r in formats
+        )
+
 
 class TestHighlightingHTML:
     def test_tag_highlighted(self, highlighter):
@@ -153,6 +193,86 @@ class TestLanguageSwitching:
         assert h.language is None
 
 
+@pytest.fixture
+def three_multiline(monkeypatch):
+    """Register a language with three multi-line constructs as "three"."""
+    monkeypatch.setitem(LANGUAGES, "three", LanguageDefinition("three", [], [
+        (TokenType.STRING, r'"""', r'"""'),
+        (TokenType.STRING, r"'''", r"'''"),
+        (TokenType.COMMENT, r'/\*', r'\*/'),
+    ]))
+
+
+@pytest.mark.usefixtures("three_multiline")
+class TestMultilineState:
+    def test_state_bits_are_distinct(self, highlighter):
+        h, doc = highlighter
+        h.set_language("three")
+        assert [bit for *_, bit in h._multiline_patterns] == [1, 2, 4]
+
+    def test_third_construct_does_not_reopen_others(self, highlighter):
+        h, doc = highlighter
+        h.set_language("three")
+        doc.setPlainText('/* open\nstill */\nafter')
+        h.rehighlight()
+        assert doc.begin().userState() == 4
+        assert doc.begin().next().userState() == 0
+        assert doc.lastBlock().userState() == 0
+
+
+class TestBlockCache:
+    def test_repeated_lines_share_cache_entry(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText("x = 1\nx = 1\nx = 1")
+        h.rehighlight()
+        keys = [key for key in h._block_cache if key[1] == "x = 1"]
+        assert len(keys) == 1
+
+    def test_blank_lines_skip_cache_and_keep_state(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText('"""\n\n    \n"""')
+        h.rehighlight()
+        assert all(key[1].strip() for key in h._block_cache)
+        second = doc.begin().next()
+        assert second.userState() == doc.begin().userState() != 0
+        assert second.next().userState() == doc.begin().userState()
+
+    def test_each_language_has_its_own_cache(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText("def foo(): pass")
+        h.rehighlight()
+        python_cache = h._block_cache
+        h.set_language("javascript")
+        assert h._block_cache is not python_cache
+        assert len(python_cache) == 1
+
+    def test_cache_kept_when_switching_back(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText("def foo(): pass")
+        h.rehighlight()
+        python_cache = dict(h._block_cache)
+        h.set_language("javascript")
+        h.set_language("python")
+        assert h._block_cache == python_cache
+
+    def test_cached_multiline_state_replayed(self, highlighter):
+        h, doc = highlighter
+        h.set_language("python")
+        doc.setPlainText('"""\nhello\n"""\n"""\nhello\n"""')
+        h.rehighlight()
+        states = []
+        block = doc.begin()
+        while block.isValid():
+            states.append(block.userState())
+            block = block.next()
+        assert states[:3] == states[3:]
+        assert states[0] != 0 and states[2] == 0
+
+
 class TestLanguageDefinitions:
     def test_all_languages_exist(self):
         assert "python" in LANGUAGES
@@ -166,6 +286,83 @@ class TestLanguageDefinitions:
     def test_javascript_has_multiline(self):
         assert len(LANGUAGES["javascript"].multiline_patterns) > 0
 
+    def test_patterns_are_precompiled(self):
+        for lang_def in LANGUAGES.values():
+            for _, regex in lang_def.patterns:
+                assert hasattr(regex, "finditer")
+            for _, start_re, end_re in lang_def.multiline_patterns:
+                assert hasattr(start_re, "search")
+                assert hasattr(end_re, "search")
+
+    def test_string_with_escaped_quote_is_one_token(self):
+        lang_def = LANGUAGES["python"]
+        match = lang_def.combined.search(r'x = "a \" b" + 1', 4)
+        assert match.group() == r'"a \" b"'
+        assert lang_def.group_types[int(match.lastgroup[1:])] == TokenType.STRING
+
+    def test_unterminated_string_runs_to_end_of_line(self):
+        lang_def = LANGUAGES["javascript"]
+        text = 'let s = "' + 'abc\\" ' * 200
+        match = lang_def.combined.search(text, 8)
+        assert match.span() == (8, len(text))
+
+    def test_keyword_trie_matches_whole_words_only(self):
+        lang_def = LANGUAGES["python"]
+        matches = {
+            match.group(): lang_def.group_types[int(match.lastgroup[1:])]
+            for match in lang_def.combined.finditer("as assert asserted async")
+        }
+        assert matches["as"] == TokenType.KEYWORD
+        assert matches["assert"] == TokenType.KEYWORD
+        assert matches["async"] == TokenType.KEYWORD
+        assert "asserted" not in matches
+
     def test_all_token_types_have_colors(self):
         for token_type in TokenType:
             assert token_type in TOKEN_COLORS
+
+
+class TestChunkedRehighlight:
+    def test_long_document_highlighted_in_slices(self, highlighter, qtbot):
+        h, doc = highlighter
+        doc.setPlainText("\n".join(["x = 1"] * (REHIGHLIGHT_CHUNK_BLOCKS * 2 + 10)))
+        h.set_language("python")
+        assert doc.findBlockByNumber(0).userState() == 0
+        assert doc.findBlockByNumber(REHIGHLIGHT_CHUNK_BLOCKS + 1).userState() == -1
+        qtbot.waitUntil(lambda: h._deferred_from is None)
+        assert doc.lastBlock().userState() == 0
+        assert doc.lastBlock().layout().formats()
+
+    def test_multiline_state_carries_across_slices(self, highlighter, qtbot):
+        h, doc = highlighter
+        lines = ["x = 1"] * (REHIGHLIGHT_CHUNK_BLOCKS - 1) + ['"""'] + ["def"] * 10
+        doc.setPlainText("\n".join(lines))
+        h.set_language("python")
+        qtbot.waitUntil(lambda: h._deferred_from is None)
+        assert doc.lastBlock().userState() != 0
+
+    def test_edits_during_pass_leave_no_block_unhighlighted(self, highlighter, qtbot):
+        h, doc = highlighter
+        doc.setPlainText("\n".join(["x = 1"] * (REHIGHLIGHT_CHUNK_BLOCKS * 3)))
+        h.set_language("python")
+        
+        # Delete lines the first slice already highlighted, shifting the
+        # still-pending blocks up past the slice boundary
+        cursor = QTextCursor(doc)
+        cursor.movePosition(QTextCursor.MoveOperation.Down,
+                            QTextCursor.MoveMode.KeepAnchor, 200)
+        cursor.removeSelectedText()
+        qtbot.waitUntil(lambda: h._deferred_from is None)
+        
+        block = doc.begin()
+        while block.isValid():
+            assert block.userState() == 0, block.blockNumber()
+            assert block.layout().formats(), block.blockNumber()
+            block = block.next()
+    
+    def test_short_document_highlighted_immediately(self, highlighter):
+        h, doc = highlighter
+        doc.setPlainText("x = 1\ny = 2")
+        h.set_language("python")
+        assert h._deferred_from is None
+        assert doc.lastBlock().userState() == 0
@@ -0,0 +1,193 @@
+"""Tests for TabWidget."""
+
+import pytest
+
+from ui.tab_widget import TabWidget
+
+
+@pytest.fixture
+def tab_widget(qtbot):
+    widget = TabWidget()
+    qtbot.addWidget(widget)
+    return widget
+
+
+class TestTabIndex:
+    def test_close_renumbers_later_tabs(self, tab_widget):
+        first = tab_widget.current_tab()
+        second = tab_widget.new_tab()
+        third = tab_widget.new_tab()
+        
+        tab_widget._close_tab(first)
+        third.editor.insertPlainText("x")
+        
+        assert tab_widget.tabText(0) == "Untitled"
+        assert tab_widget.tabText(1) == "Untitled *"
+        assert tab_widget._tab_index == {second: 0, third: 1}
+    
+    def test_moved_tab_stays_current(self, tab_widget):
+        first = tab_widget.current_tab()
+        second = tab_widget.new_tab()
+        third = tab_widget.new_tab()
+        
+        tab_widget.tabBar().moveTab(2, 0)
+        
+        assert tab_widget.current_tab() is third
+        assert tab_widget._tabs == [third, first, second]
+        assert tab_widget._tab_index == {third: 0, first: 1, second: 2}
+    
+    def test_close_button_closes_its_own_tab(self, tab_widget):
+        from PyQt6.QtWidgets import QTabBar
+        first = tab_widget.current_tab()
+        tab_widget.new_tab()
+        
+        tab_widget.tabBar().tabButton(1, QTabBar.ButtonPosition.RightSide).click()
+        
+        assert tab_widget._tabs == [first]
+    
+    def test_switching_tabs_reports_document_change(self, tab_widget):
+        tab_widget.new_tab()
+        changes = []
+        tab_widget.current_document_changed.connect(lambda: changes.append(None))
+        
+        tab_widget.setCurrentIndex(0)
+        
+        assert len(changes) == 1
+    
+    def test_unchanged_title_not_reset(self, tab_widget, monkeypatch):
+        tab = tab_widget.current_tab()
+        calls = []
+        monkeypatch.setattr(tab_widget, "setTabText", lambda *args: calls.append(args))
+        
+        tab_widget._update_tab_title(tab)
+        tab.document.is_modified = True
+        tab_widget._update_tab_title(tab)
+        
+        assert calls == [(0, "Untitled *")]
+
+
+class TestOpenFiles:
+    def test_opens_each_file_and_notifies_once(self, tab_widget, tmp_path):
+        paths = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            path = tmp_path / name
+            path.write_text(name)
+            paths.append(str(path))
+        changes = []
+        tab_widget.current_document_changed.connect(lambda: changes.append(None))
+        
+        assert tab_widget.open_files(paths) is True
+        
+        assert [tab.document.file_path for tab in tab_widget._tabs] == paths
+        assert tab_widget.current_document.file_path == paths[-1]
+        assert len(changes) == 1
+    
+    def test_reports_missing_file(self, tab_widget, tmp_path):
+        assert tab_widget.open_files([str(tmp_path / "missing.txt")]) is False
+        assert tab_widget.signalsBlocked() is False
+
+
+class TestDeferredHighlighting:
+    def test_language_applied_when_tab_first_shown(self, tab_widget, tmp_path):
+        path = tmp_path / "script.py"
+        path.write_text("def foo(): pass\n")
+        tab = tab_widget.new_tab(str(path))
+        highlighter = tab.editor.syntax_highlighter
+        
+        assert highlighter.language is None
+        
+        tab_widget.show()
+        
+        assert highlighter.language == "python"
+    
+    def test_files_opened_together_highlight_only_current_tab(self, tab_widget, tmp_path):
+        tab_widget.show()
+        # Keep the files out of the initial tab, which is already shown
+        tab_widget.current_editor.setPlainText("scratch")
+        paths = []
+        for name in ("a.py", "b.py", "c.py"):
+            path = tmp_path / name
+            path.write_text("def foo(): pass\n")
+            paths.append(str(path))
+        
+        tab_widget.open_files(paths)
+        
+        languages = [tab.editor.syntax_highlighter.language for tab in tab_widget._tabs[1:]]
+        assert languages == [None, None, "python"]
+        
+        tab_widget.setCurrentIndex(1)
+        
+        assert tab_widget._tabs[1].editor.syntax_highlighter.language == "python"
+    
+    def test_language_set_directly_once_shown(self, tab_widget):
+        tab_widget.show()
+        editor = tab_widget.current_editor
+        
+        editor.set_syntax_language("css")
+        
+        assert editor.syntax_highlighter.language == "css"
+
+
+@pytest.fixture
+def large_file(tmp_path, monkeypatch):
+    """A file that TabWidget streams in many small chunks."""
+    import ui.tab_widget
+    import actions.file_actions
+    monkeypatch.setattr(ui.tab_widget, "STREAM_LOAD_THRESHOLD", 10)
+    monkeypatch.setattr(actions.file_actions, "LOAD_CHUNK_SIZE", 8)
+    path = tmp_path / "large.txt"
+    path.write_text("line of text\n" * 2000)
+    return str(path)
+
+
+class TestClosingWhileLoading:
+    def test_closing_split_pane_stops_its_load(self, qtbot, large_file):
+        from ui.split_view import SplitViewManager
+        manager = SplitViewManager()
+        qtbot.addWidget(manager)
+        manager._handle_split(manager._panes[0], "right", large_file)
+        tab_widget = manager._panes[1].tab_widget
+        tab = tab_widget.current_tab()
+        loader = tab.loader
+        
+        tab_widget._close_tab(tab)
+        qtbot.wait(50)
+        
+        assert manager.split_count() == 1
+        assert loader.isFinished()
+    
+    def test_kept_last_tab_is_detached_from_partial_file(self, tab_widget, large_file):
+        tab_widget.open_file(large_file)
+        tab = tab_widget.current_tab()
+        
+        tab_widget._close_tab(tab)
+        
+        assert tab_widget._tabs == [tab]
+        assert tab.loader is None
+        assert tab.document.file_path is None
+        assert tab.editor.isReadOnly() is False
+    
+    def test_failed_load_warns_and_detaches_file(self, tab_widget, large_file, monkeypatch):
+        from PyQt6.QtWidgets import QMessageBox
+        warnings = []
+        monkeypatch.setattr(QMessageBox, "warning", lambda *args: warnings.append(args))
+        tab_widget.open_file(large_file)
+        tab = tab_widget.current_tab()
+        
+        tab.loader.load_failed.emit("disk error")
+        
+        assert len(warnings) == 1
+        assert "large.txt" in warnings[0][2] and "disk error" in warnings[0][2]
+        assert tab.document.file_path is None
+        assert tab_widget.tabText(0) == "Untitled"
+    
+    def test_destroying_widget_stops_loads(self, qtbot, large_file):
+        from PyQt6 import sip
+        tab_widget = TabWidget()
+        tab_widget.open_file(large_file)
+        loader = tab_widget.current_tab().loader
+        
+        sip.delete(tab_widget)
+        qtbot.wait(50)
+        
+        assert loader.isFinished()